@@ -24,6 +24,9 @@ from utils.logging_config import setup_logging
 loggers = setup_logging(debug=True)
 logger = loggers.get('evaluation', logging.getLogger(__name__))
 
+# Disclosure record formats accepted by evaluate_disclosures(format_hint=...)
+DISCLOSURE_FORMATS = frozenset({"typed_counts", "status_list", "empty"})
+
 class AlertSeverity(Enum):
     """Defines severity levels for compliance alerts."""
     LOW = "LOW"
@@ -596,7 +599,8 @@ def evaluate_disclosures(
     disclosures: List[Dict[str, Any]],
     business_name: str,
     disclosure_flag: Optional[str] = None,
-    finra_disclosures: Optional[List[Dict[str, Any]]] = None
+    finra_disclosures: Optional[List[Dict[str, Any]]] = None,
+    format_hint: Optional[str] = None
 ) -> Tuple[bool, str, List[Alert]]:
     """
     Evaluate the firm's disclosure history for compliance and risk.
@@ -606,20 +610,35 @@ def evaluate_disclosures(
         business_name: Name of the business for reporting
         disclosure_flag: Optional flag indicating if disclosures exist (e.g., "Y" or "N")
         finra_disclosures: Optional list of FINRA disclosure records to check as fallback
+        format_hint: Optional known format of the disclosure records: "typed_counts"
+            (disclosureType/disclosureCount), "status_list" (status/date records) or
+            "empty" (no records); when omitted the format is detected from the records
         
     Returns:
         Tuple containing:
         - bool: Compliance status
         - str: Explanation of the evaluation
         - List[Alert]: List of generated alerts
+        
+    Raises:
+        ValueError: If format_hint is not one of DISCLOSURE_FORMATS
     """
     logger.debug(f"Evaluating disclosures for {business_name}")
     alerts = []
     
+    if format_hint is not None and format_hint not in DISCLOSURE_FORMATS:
+        raise ValueError(f"Unknown disclosure format hint: {format_hint!r}, expected one of {sorted(DISCLOSURE_FORMATS)}")
+    if format_hint == "empty" and disclosures:
+        # The hint contradicts the data; never skip real records
+        logger.warning(f"Disclosure format hint 'empty' given with {len(disclosures)} record(s) for {business_name}, detecting format instead")
+        format_hint = None
+    
     # First check if we have actual disclosures
     if disclosures:
         # Check if we have the new format with disclosureType and disclosureCount
-        if any('disclosureType' in d for d in disclosures):
+        if format_hint is None:
+            format_hint = "typed_counts" if any('disclosureType' in d for d in disclosures) else "status_list"
+        if format_hint == "typed_counts":
             total_disclosure_count = 0
             disclosure_types = []
             
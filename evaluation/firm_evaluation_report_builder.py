@@ -7,7 +7,21 @@ results through method chaining and produces a structured output for downstream
 """
 
 from collections import OrderedDict
-from typing import Dict, Any, cast
+from typing import Dict, Any, Optional, cast
+
+def _construct_sec_number(sec_result: Dict[str, Any]) -> Optional[str]:
+    """Build an SEC number from its type prefix and number, defaulting the prefix to 801."""
+    number = sec_result.get("firm_ia_sec_number")
+    if number:
+        return f"{sec_result.get('firm_ia_sec_number_type', '801')}-{number}"
+    return None
+
+# Sources for the SEC number when basic_result has none, tried in order against
+# sec_search_result; the first non-empty value wins
+_SEC_NUMBER_FALLBACKS = (
+    lambda sec_result: sec_result.get("firm_ia_full_sec_number"),
+    _construct_sec_number,
+)
 
 class FirmEvaluationReportBuilder:
     """Constructs compliance reports for business entities by collecting sub-evaluations."""
@@ -86,14 +100,12 @@ class FirmEvaluationReportBuilder:
             
             # If SEC number is empty, try to get it from sec_search_result
             if not sec_number and "sec_search_result" in search_evaluation:
-                sec_result = search_evaluation.get("sec_search_result", {})
-                # Try to get SEC number from firm_ia_full_sec_number first
-                if sec_result.get("firm_ia_full_sec_number"):
-                    sec_number = sec_result.get("firm_ia_full_sec_number")
-                # If not available, try to construct it from firm_ia_sec_number
-                elif sec_result.get("firm_ia_sec_number"):
-                    sec_number_type = sec_result.get("firm_ia_sec_number_type", "801")
-                    sec_number = f"{sec_number_type}-{sec_result.get('firm_ia_sec_number')}"
+                sec_result = search_evaluation.get("sec_search_result") or {}
+                for extract in _SEC_NUMBER_FALLBACKS:
+                    value = extract(sec_result)
+                    if value:
+                        sec_number = value
+                        break
             
             entity_data = {
                 "firm_name": basic_result.get("firm_name", ""),
@@ -0,0 +1,51 @@
+"""
+caching_facade.py
+
+This module provides CachingFirmServicesFacade, a FirmServicesFacade that reuses
+successful search-by-CRD results for its lifetime. Scripts that look a firm up
+and then pass the same facade to process_claim (which searches again) share one
+instance so each CRD is only fetched once per run.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Add parent directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.firm_services import FirmServicesFacade
+
+class CachingFirmServicesFacade(FirmServicesFacade):
+    """FirmServicesFacade that reuses successful CRD lookups for the rest of the run."""
+
+    def __init__(self):
+        super().__init__()
+        self._crd_results: Dict[str, Dict[str, Any]] = {}
+        self._crd_results_lock = threading.Lock()
+
+    def search_firm_by_crd(self, subject_id: str, crd_number: str, entity_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Search by CRD, reusing an earlier result; misses and errors are not cached.
+
+        Results are keyed by CRD number alone: FirmServicesFacade.search_firm_by_crd
+        only uses entity_name for logging, so it does not change the result.
+        Concurrent misses for the same CRD may both fetch; the first result stored wins.
+
+        Args:
+            subject_id: The ID of the subject/client making the request
+            crd_number: The firm's CRD number
+            entity_name: Optional entity name for logging
+
+        Returns:
+            Firm details if found, None otherwise
+        """
+        with self._crd_results_lock:
+            result = self._crd_results.get(crd_number)
+        if result is None:
+            result = super().search_firm_by_crd(subject_id, crd_number, entity_name)
+            if result is not None:
+                with self._crd_results_lock:
+                    result = self._crd_results.setdefault(crd_number, result)
+        return result
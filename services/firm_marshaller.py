@@ -11,10 +11,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 import json
 import logging
 from logging import Logger
-from typing import Dict, List, Optional, Any, Callable, Union, TypeVar, Generic
+from typing import Dict, List, Optional, Any, Callable, Sequence, Union, TypeVar, Generic
 import time
 from datetime import datetime, timedelta
 from functools import wraps, partial
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
@@ -406,6 +407,56 @@ fetch_sec_firm_search = create_fetcher("SEC_FirmIAPD_Agent", "search_firm")
 fetch_sec_firm_by_crd = create_fetcher("SEC_FirmIAPD_Agent", "search_firm_by_crd")
 fetch_sec_firm_details = create_fetcher("SEC_FirmIAPD_Agent", "get_firm_details")
 
+# Search-by-CRD fetchers keyed by source
+CRD_SEARCH_FETCHERS: Dict[str, Callable[[str, str, Dict[str, Any]], FirmSearchResponse]] = {
+    "sec": fetch_sec_firm_by_crd,
+    "finra": fetch_finra_firm_by_crd
+}
+
+def fetch_firm_by_crd_all_sources(
+    subject_id: str,
+    crd_number: str,
+    sources: Sequence[str] = ("sec", "finra"),
+    call: Optional[Callable[[str, Callable[[], FirmSearchResponse]], Optional[FirmSearchResponse]]] = None
+) -> Dict[str, Optional[FirmSearchResponse]]:
+    """
+    Search SEC and/or FINRA by CRD number in a single concurrent fan-out.
+    
+    The CRD is normalized and the cache key / request params are built once and
+    shared by every lookup. The agents are blocking, so multiple sources run on
+    a small thread pool and overlap their network round-trips.
+    
+    Args:
+        subject_id: The ID of the subject/client making the request
+        crd_number: The firm's CRD number
+        sources: Sources to query, any of "sec" and "finra"
+        call: Optional per-source wrapper, called as call(source, fetch) inside
+            the fan-out, e.g. to rate limit or retry one source without
+            refetching the others; its return value is used as the response
+        
+    Returns:
+        Dict mapping each requested source to its response
+    """
+    crd_number = str(crd_number).strip()
+    firm_id = f"search_crd_{crd_number}"
+    params = {"crd_number": crd_number}
+    fetchers = {
+        source: partial(CRD_SEARCH_FETCHERS[source], subject_id, firm_id, params)
+        for source in sources
+    }
+    
+    def run(source: str) -> Optional[FirmSearchResponse]:
+        fetcher = fetchers[source]
+        return call(source, fetcher) if call else fetcher()
+    
+    if len(fetchers) == 1:
+        source = next(iter(fetchers))
+        return {source: run(source)}
+    
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        futures = {source: executor.submit(run, source) for source in fetchers}
+        return {source: future.result() for source, future in futures.items()}
+
 def main():
     """Example usage of the firm marshaller."""
     # Example firm search
@@ -4,9 +4,32 @@ firm_name_matcher.py
 This module provides the FirmNameMatcher class for fuzzy name matching of firm names.
 """
 
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
 from difflib import SequenceMatcher
 
+# Common business suffixes removed during normalization
+_BUSINESS_SUFFIXES = (
+    ' llc', ' inc', ' corp', ' corporation', ' ltd', ' limited',
+    ' lp', ' llp', ' l.l.c.', ' inc.', ' corp.', ' ltd.'
+)
+
+@lru_cache(maxsize=8192)
+def _normalize_name_cached(name: str) -> str:
+    """Normalize a firm name for comparison; results are memoized per name."""
+    # Convert to lowercase
+    normalized = name.lower()
+    
+    # Remove common business suffixes
+    for suffix in _BUSINESS_SUFFIXES:
+        normalized = normalized.replace(suffix, '')
+        
+    # Remove special characters and extra whitespace
+    normalized = ''.join(c for c in normalized if c.isalnum() or c.isspace())
+    normalized = ' '.join(normalized.split())
+    
+    return normalized
+
 class FirmNameMatcher:
     """Service for fuzzy matching of firm names."""
     
@@ -52,22 +75,28 @@ class FirmNameMatcher:
         Returns:
             Normalized firm name
         """
-        # Convert to lowercase
-        normalized = name.lower()
+        return _normalize_name_cached(name)
         
-        # Remove common business suffixes
-        suffixes = [
-            ' llc', ' inc', ' corp', ' corporation', ' ltd', ' limited',
-            ' lp', ' llp', ' l.l.c.', ' inc.', ' corp.', ' ltd.'
-        ]
-        for suffix in suffixes:
-            normalized = normalized.replace(suffix, '')
-            
-        # Remove special characters and extra whitespace
-        normalized = ''.join(c for c in normalized if c.isalnum() or c.isspace())
-        normalized = ' '.join(normalized.split())
+    def similarity_matrix(self, names_a: Sequence[str], names_b: Sequence[str]) -> List[List[float]]:
+        """
+        Calculate pairwise similarity scores between two lists of firm names.
+        
+        Each name is normalized once, so comparing N names against M names
+        costs N + M normalizations rather than N * M.
         
-        return normalized
+        Args:
+            names_a: Names for the rows of the matrix
+            names_b: Names for the columns of the matrix
+            
+        Returns:
+            Matrix where entry [i][j] is the similarity of names_a[i] and names_b[j]
+        """
+        normalized_a = [self._normalize_name(name) for name in names_a]
+        normalized_b = [self._normalize_name(name) for name in names_b]
+        return [
+            [self._calculate_similarity(a, b) for b in normalized_b]
+            for a in normalized_a
+        ]
         
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """
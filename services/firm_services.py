@@ -9,6 +9,7 @@ and provides a unified interface for business logic to retrieve and store normal
 import json
 import logging
 import argparse
+import threading
 import time
 from typing import Optional, Dict, Any, List, Union
 import sys
@@ -42,17 +43,24 @@ class FirmServicesFacade:
         self.firm_marshaller = FirmMarshaller()
         self.last_api_call_time = 0
         self.service_delay = 4  # 4 second delay between API calls at service level
+        self._service_delay_lock = threading.Lock()
         logger.debug("FirmServicesFacade initialized")
     
     def _apply_service_delay(self):
-        """Apply a delay between API calls to prevent rate limiting issues."""
-        current_time = time.time()
-        elapsed = current_time - self.last_api_call_time
-        if elapsed < self.service_delay:
-            delay = self.service_delay - elapsed
-            logger.debug(f"Applying service-level delay of {delay:.2f}s")
-            time.sleep(delay)
-        self.last_api_call_time = time.time()
+        """
+        Apply a delay between API calls to prevent rate limiting issues.
+        
+        The check and update happen under a lock, so threads sharing one facade
+        take turns instead of all seeing the same last call time.
+        """
+        with self._service_delay_lock:
+            current_time = time.time()
+            elapsed = current_time - self.last_api_call_time
+            if elapsed < self.service_delay:
+                delay = self.service_delay - elapsed
+                logger.debug(f"Applying service-level delay of {delay:.2f}s")
+                time.sleep(delay)
+            self.last_api_call_time = time.time()
 
     def search_firm(self, subject_id: str, firm_name: str) -> List[Dict[str, Any]]:
         """
@@ -5,83 +5,81 @@ This script tests how the SEC number is populated in the compliance report.
 """
 
 import sys
-import json
+import argparse
+from collections import ChainMap
 from pathlib import Path
 import logging
-from datetime import datetime
 
-# Add parent directory to Python path
-sys.path.append(str(Path(__file__).parent))
+# Add parent directory to Python path (once, so repeated imports don't grow it)
+_PROJECT_ROOT = str(Path(__file__).parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
 from agents.finra_firm_broker_check_agent import FinraFirmBrokerCheckAgent
 from agents.sec_firm_iapd_agent import SECFirmIAPDAgent
+from utils.logging_config import LazyJson
+from utils.report_io import build_claim, finalize_report
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                   datefmt='%Y-%m-%dT%H:%M:%S')
 logger = logging.getLogger(__name__)
 
-def main():
-    """Generate a full compliance report for firm with CRD 5049 with focus on SEC number."""
+def run(crd_number: str, subject_id: str = "test_subject", skip_adv: bool = True, pretty: bool = False):
+    """Generate a full compliance report for a firm with focus on SEC number.
+    
+    Args:
+        crd_number: The firm's CRD number
+        subject_id: The ID of the subject/client making the request
+        skip_adv: Whether to skip ADV evaluation
+        pretty: Whether to pretty-print the firm details in the logs
+    """
     # Create facade
     facade = FirmServicesFacade()
     
-    # Search parameters
-    subject_id = "test_subject"
-    crd_number = "5049"
-    
     # Direct API calls to diagnose the issue
     logger.info("Directly testing SEC API for CRD: %s", crd_number)
     sec_agent = SECFirmIAPDAgent(use_mock=False)
     sec_result = sec_agent.search_firm_by_crd(crd_number)
-    logger.info("SEC API direct result: %s", json.dumps(sec_result, indent=2, default=str) if sec_result else "No result")
+    logger.info("SEC API direct result: %s", LazyJson(sec_result) if sec_result else "No result")
     
     logger.info("Directly testing FINRA API for CRD: %s", crd_number)
     finra_agent = FinraFirmBrokerCheckAgent(use_mock=False)
     finra_result = finra_agent.search_firm_by_crd(crd_number)
-    logger.info("FINRA API direct result: %s", json.dumps(finra_result, indent=2, default=str) if finra_result else "No result")
+    logger.info("FINRA API direct result: %s", LazyJson(finra_result) if finra_result else "No result")
     
     # Search for firm by CRD using the facade
     logger.info("Searching for firm with CRD: %s using facade", crd_number)
     firm_details = facade.search_firm_by_crd(subject_id, crd_number)
     
     if firm_details:
-        logger.info("Firm details found: %s", json.dumps(firm_details, indent=2, default=str))
+        if pretty:
+            logger.info("Firm details found: %s", LazyJson(firm_details))
+        else:
+            logger.info("Firm details found: %r", firm_details)
         
         # Create a claim for processing
-        claim = {
-            "reference_id": f"test-ref-{crd_number}",
-            "business_ref": f"BIZ_{crd_number}",
-            "business_name": firm_details.get('firm_name', 'Unknown'),
-            "organization_crd": crd_number
-        }
+        firm_name = firm_details.get('firm_name', 'Unknown')
+        claim = build_claim(crd_number, firm_name)
         
         # Process the claim to generate a compliance report
-        logger.info("Generating compliance report for %s (CRD: %s)", firm_details.get('firm_name', 'Unknown'), crd_number)
+        logger.info("Generating compliance report for %s (CRD: %s)", firm_name, crd_number)
         report = process_claim(
             claim=claim,
             facade=facade,
             business_ref=claim["business_ref"],
             skip_financials=False,
-            skip_legal=False
+            skip_legal=False,
+            skip_adv=skip_adv
         )
         
         if report:
-            # Add the claim to the report
-            report["claim"] = claim
-            
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
-            
-            # Save the report to a file
-            output_file = f"compliance_report_crd_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-            
-            logger.info("Compliance report saved to %s", output_file)
+            # Attach claim and timestamp, save and print the report
+            finalize_report(report, claim, f"compliance_report_crd_{crd_number}.json")
             
             # Examine SEC number in the report
             entity_sec_number = report.get('entity', {}).get('sec_number', 'Not found')
@@ -116,28 +114,31 @@ def main():
             
             # Evaluate registration status
             logger.info("Evaluating registration status")
-            # Extract the entity information from the report for evaluation
-            business_info = report.get('entity', {})
-            # Add additional fields that might be in basic_result
-            if 'basic_result' in report.get('search_evaluation', {}):
-                basic_result = report['search_evaluation']['basic_result']
+            # Overlay basic_result fields on a read-only view of the entity
+            # section instead of copying it (evaluation only reads)
+            overlay = {}
+            search_evaluation = report.get('search_evaluation', {})
+            if 'basic_result' in search_evaluation:
+                basic_result = search_evaluation['basic_result']
                 # Add source information
-                business_info['source'] = report.get('search_evaluation', {}).get('source')
+                overlay['source'] = search_evaluation.get('source')
                 # Add raw_data if available
                 if 'raw_data' in basic_result:
-                    business_info['raw_data'] = basic_result['raw_data']
+                    overlay['raw_data'] = basic_result['raw_data']
+            business_info = ChainMap(overlay, report.get('entity', {}))
             
             is_compliant, explanation, alerts = evaluate_registration_status(business_info)
             
             logger.info("Registration status: %s", "Compliant" if is_compliant else "Non-compliant")
             logger.info("Explanation: %s", explanation)
-            
-            # Print the report
-            print(json.dumps(report, indent=2, default=str))
         else:
             logger.error("Failed to generate compliance report")
     else:
         logger.error("No firm found with CRD: %s", crd_number)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a compliance report with focus on SEC number")
+    parser.add_argument("crd_number", nargs="?", default="5049", help="Firm CRD number")
+    parser.add_argument("--pretty", action="store_true", help="Pretty-print firm details in the logs")
+    args = parser.parse_args()
+    run(args.crd_number, pretty=args.pretty)
\ No newline at end of file
@@ -4,76 +4,63 @@ Script to generate a full compliance report with ADV evaluation skipped.
 """
 
 import sys
-import json
 from pathlib import Path
 import logging
-from datetime import datetime
 
-# Add parent directory to Python path
-sys.path.append(str(Path(__file__).parent))
+# Add parent directory to Python path (once, so repeated imports don't grow it)
+_PROJECT_ROOT = str(Path(__file__).parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
+from utils.report_io import build_claim, finalize_report
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                   datefmt='%Y-%m-%dT%H:%M:%S')
 logger = logging.getLogger(__name__)
 
-def main():
-    """Generate a full compliance report with ADV evaluation skipped."""
+def run(crd_number: str, subject_id: str = "test_subject", skip_adv: bool = True):
+    """Generate a full compliance report with ADV evaluation skipped.
+    
+    Args:
+        crd_number: The firm's CRD number
+        subject_id: The ID of the subject/client making the request
+        skip_adv: Whether to skip ADV evaluation
+    """
     # Create facade
     facade = FirmServicesFacade()
     
-    # Search parameters
-    subject_id = "test_subject"
-    crd_number = "284175"  # Gordon Dyal & Co., LLC
-    
     # Search for firm by CRD
     logger.info(f"Searching for firm with CRD: {crd_number}")
     firm_details = facade.search_firm_by_crd(subject_id, crd_number)
     
     if firm_details:
         # Create a claim for processing
-        claim = {
-            "reference_id": f"test-ref-{crd_number}",
-            "business_ref": f"BIZ_{crd_number}",
-            "business_name": firm_details.get('firm_name', 'Unknown'),
-            "organization_crd": crd_number
-        }
+        firm_name = firm_details.get('firm_name', 'Unknown')
+        claim = build_claim(crd_number, firm_name)
         
         # Process the claim to generate a compliance report with ADV evaluation skipped
-        logger.info(f"Generating compliance report for {firm_details.get('firm_name', 'Unknown')} (CRD: {crd_number}) with ADV evaluation skipped")
+        logger.info(f"Generating compliance report for {firm_name} (CRD: {crd_number}) with ADV evaluation skipped")
         report = process_claim(
             claim=claim,
             facade=facade,
             business_ref=claim["business_ref"],
             skip_financials=False,
             skip_legal=False,
-            skip_adv=True  # Skip ADV evaluation
+            skip_adv=skip_adv
         )
         
         if report:
-            # Add the claim to the report
-            report["claim"] = claim
-            
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
-            
-            # Save the report to a file
-            output_file = f"compliance_report_{crd_number}_skip_adv.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-            
-            logger.info(f"Compliance report saved to {output_file}")
-            
-            # Print the report
-            print(json.dumps(report, indent=2, default=str))
+            # Attach claim and timestamp, save and print the report
+            finalize_report(report, claim, f"compliance_report_{crd_number}_skip_adv.json")
         else:
             logger.error("Failed to generate compliance report")
     else:
         logger.error(f"No firm found with CRD: {crd_number}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run(sys.argv[1] if len(sys.argv) > 1 else "284175")  # Gordon Dyal & Co., LLC
\ No newline at end of file
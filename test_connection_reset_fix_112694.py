@@ -5,28 +5,40 @@ This script implements retry logic and better error handling to address the conn
 """
 
 import sys
-import json
 import time
 import logging
 import requests
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, Union
 
-# Add parent directory to Python path
-sys.path.append(str(Path(__file__).parent))
+# Prefer a C-accelerated parser for the (potentially large) FINRA content payload
+try:
+    from orjson import loads as _loads
+except ImportError:
+    try:
+        from ujson import loads as _loads
+    except ImportError:
+        from json import loads as _loads
+
+# Add parent directory to Python path (once, so repeated imports don't grow it)
+_PROJECT_ROOT = str(Path(__file__).parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from services.firm_services import FirmServicesFacade
 from services.firm_marshaller import (
-    fetch_sec_firm_by_crd,
-    fetch_finra_firm_by_crd,
+    fetch_firm_by_crd_all_sources,
     ResponseStatus
 )
 from services.firm_business import process_claim
+from utils.logging_config import LazyJson
+from utils.rate_limiter import TokenBucket
+from utils.report_io import build_claim, finalize_report
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                   datefmt='%Y-%m-%dT%H:%M:%S')
 logger = logging.getLogger(__name__)
 
 class RetryableFirmServicesFacade(FirmServicesFacade):
@@ -37,7 +49,13 @@ class RetryableFirmServicesFacade(FirmServicesFacade):
         super().__init__()
         self.max_retries = max_retries
         self.base_delay = base_delay
-        self.service_delay = 6  # Increase default delay between API calls
+        self.service_delay = 6  # Average spacing between calls to the same host
+        # Per-host token buckets: only wait when a host's budget is exhausted,
+        # instead of a flat sleep before every call
+        self._buckets = {
+            "sec": TokenBucket(rate=1 / self.service_delay, capacity=2),
+            "finra": TokenBucket(rate=1 / self.service_delay, capacity=2)
+        }
         logger.info(f"RetryableFirmServicesFacade initialized with max_retries={max_retries}, base_delay={base_delay}s")
     
     def _retry_operation(self, operation_name: str, operation_func, *args, **kwargs) -> Tuple[bool, Any]:
@@ -84,7 +102,6 @@ class RetryableFirmServicesFacade(FirmServicesFacade):
         }
         
         logger.info(f"Searching for firm by CRD: {crd_number} with retry logic", extra=log_context)
-        firm_id = f"search_crd_{crd_number}"
         
         # First, check if we can find the firm in either database with retry logic
         found_firm = False
@@ -92,34 +109,31 @@ class RetryableFirmServicesFacade(FirmServicesFacade):
         sec_data = None
         finra_data = None
         
-        # Try SEC with retry logic
-        sec_found = False
-        operation_name = f"SEC search for CRD {crd_number}"
+        def search_operation(host, fetch):
+            self._buckets[host].take()
+            return fetch()
         
-        def sec_search_operation():
-            self._apply_service_delay()
-            return fetch_sec_firm_by_crd(subject_id, firm_id, {"crd_number": crd_number})
+        def fetch_one(host, fetch):
+            # Each source is retried on its own inside the fan-out, so a failure
+            # on one host never refetches the other
+            success, response = self._retry_operation(f"{host.upper()} search for CRD {crd_number}", search_operation, host, fetch)
+            return response if success else None
         
-        sec_success, sec_response = self._retry_operation(operation_name, sec_search_operation)
+        # Fetch SEC and FINRA together, regardless of the SEC result
+        responses = fetch_firm_by_crd_all_sources(subject_id, crd_number, ("sec", "finra"), call=fetch_one)
+        sec_response = responses.get("sec")
+        finra_response = responses.get("finra")
         
-        if sec_success and sec_response and sec_response.status == ResponseStatus.SUCCESS and sec_response.data:
+        sec_found = False
+        if sec_response and sec_response.status == ResponseStatus.SUCCESS and sec_response.data:
             logger.info(f"Found SEC result for CRD {crd_number}", extra=log_context)
             found_firm = True
             sec_found = True
             source = "SEC"  # Temporary source, will be updated based on registration status
             sec_data = sec_response.data
         
-        # Always try FINRA too, regardless of SEC result
         finra_found = False
-        operation_name = f"FINRA search for CRD {crd_number}"
-        
-        def finra_search_operation():
-            self._apply_service_delay()
-            return fetch_finra_firm_by_crd(subject_id, firm_id, {"crd_number": crd_number})
-        
-        finra_success, finra_response = self._retry_operation(operation_name, finra_search_operation)
-        
-        if finra_success and finra_response and finra_response.status == ResponseStatus.SUCCESS and finra_response.data:
+        if finra_response and finra_response.status == ResponseStatus.SUCCESS and finra_response.data:
             logger.info(f"Found FINRA result for CRD {crd_number}", extra=log_context)
             found_firm = True
             finra_found = True
@@ -182,19 +196,21 @@ class RetryableFirmServicesFacade(FirmServicesFacade):
             finra_data = {}  # Fallback to empty dict if somehow not a dict
             
         # FINRA data might be nested in a 'content' field as a JSON string
-        if isinstance(finra_data, dict) and 'content' in finra_data and isinstance(finra_data.get('content'), str):
+        content_str = finra_data.get('content')
+        if isinstance(content_str, str):
             try:
-                content = json.loads(finra_data.get('content', '{}'))
-                if isinstance(content, dict) and 'basicInformation' in content:
+                content = _loads(content_str)
+                firm_info = content.get('basicInformation') if isinstance(content, dict) else None
+                if firm_info is not None:
                     basic_info = {
-                        'crd_number': str(content['basicInformation'].get('firmId', '')),
-                        'firm_name': content['basicInformation'].get('firmName', 'Unknown'),
-                        'other_names': content['basicInformation'].get('otherNames', []),
-                        'registration_status': content['basicInformation'].get('iaScope', 'ACTIVE'),
+                        'crd_number': str(firm_info.get('firmId', '')),
+                        'firm_name': firm_info.get('firmName', 'Unknown'),
+                        'other_names': firm_info.get('otherNames', []),
+                        'registration_status': firm_info.get('iaScope', 'ACTIVE'),
                         'firm_status': 'active'
                     }
                     return basic_info
-            except (json.JSONDecodeError, KeyError) as e:
+            except (ValueError, KeyError) as e:  # JSONDecodeError for all parsers is a ValueError
                 logger.error(f"Error parsing FINRA content: {str(e)}")
         
         # Fallback to direct extraction
@@ -207,61 +223,51 @@ class RetryableFirmServicesFacade(FirmServicesFacade):
         
         return basic_info
 
-def main():
-    """Test the enhanced firm search with retry logic for CRD 112694."""
+def run(crd_number: str, subject_id: Optional[str] = None, skip_adv: bool = True):
+    """Test the enhanced firm search with retry logic for a CRD.
+    
+    Args:
+        crd_number: The firm's CRD number
+        subject_id: The ID of the subject/client making the request
+            (defaults to test_subject_<crd_number>)
+        skip_adv: Whether to skip ADV evaluation
+    """
     # Create enhanced facade with retry logic
     facade = RetryableFirmServicesFacade(max_retries=3, base_delay=5)
     
     # Search parameters
-    subject_id = "test_subject_112694"
-    crd_number = "112694"
+    subject_id = subject_id or f"test_subject_{crd_number}"
     
     # Search for firm by CRD with enhanced retry logic
     logger.info(f"Searching for firm with CRD: {crd_number} using enhanced retry logic")
     firm_details = facade.search_firm_by_crd(subject_id, crd_number)
     
     # Log the raw response for debugging
-    logger.info(f"Raw firm details: {json.dumps(firm_details, indent=2, default=str)}")
+    logger.info("Raw firm details: %s", LazyJson(firm_details))
     
     if firm_details:
         # Create a claim for processing
-        claim = {
-            "reference_id": f"test-ref-{crd_number}",
-            "business_ref": f"BIZ_{crd_number}",
-            "business_name": firm_details.get('firm_name', 'Unknown'),
-            "organization_crd": crd_number
-        }
+        firm_name = firm_details.get('firm_name', 'Unknown')
+        claim = build_claim(crd_number, firm_name)
         
         # Process the claim to generate a compliance report
-        logger.info(f"Generating compliance report for {firm_details.get('firm_name', 'Unknown')} (CRD: {crd_number})")
+        logger.info(f"Generating compliance report for {firm_name} (CRD: {crd_number})")
         report = process_claim(
             claim=claim,
             facade=facade,
             business_ref=claim["business_ref"],
             skip_financials=False,
-            skip_legal=False
+            skip_legal=False,
+            skip_adv=skip_adv
         )
         
         if report:
-            # Add the claim to the report
-            report["claim"] = claim
-            
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
-            
-            # Save the report to a file
-            output_file = f"compliance_report_{crd_number}_fixed.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-            
-            logger.info(f"Compliance report saved to {output_file}")
-            
-            # Print the report
-            print(json.dumps(report, indent=2, default=str))
+            # Attach claim and timestamp, save and print the report
+            finalize_report(report, claim, f"compliance_report_{crd_number}_fixed.json")
         else:
             logger.error("Failed to generate compliance report")
     else:
         logger.error(f"No firm found with CRD: {crd_number}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run(sys.argv[1] if len(sys.argv) > 1 else "112694")
\ No newline at end of file
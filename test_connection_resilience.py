@@ -3,142 +3,306 @@
 Test script to verify the connection resilience improvements.
 
 This script tests the SEC and FINRA agents' ability to handle connection reset errors
-by making multiple API calls in sequence and reporting success rates.
+by making multiple concurrent API calls and reporting success rates.
 """
 
 import sys
 import time
+import random
+import queue
+import asyncio
 import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from collections import Counter
+
+import requests
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from agents.sec_firm_iapd_agent import SECFirmIAPDAgent
-from agents.finra_firm_broker_check_agent import FinraFirmBrokerCheckAgent
+# Agent modules are imported inside the tests that use them, so --sec-only
+# and --finra-only runs only load the agent they exercise
+from utils.rate_limiter import TokenBucket
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-def test_sec_agent(crd_numbers, iterations=3, delay=1.0):
-    """Test the SEC agent with multiple CRD numbers."""
-    logger.info(f"Testing SEC agent with {len(crd_numbers)} CRD numbers, {iterations} iterations each")
+# Maximum number of CRD lookups in flight at once
+MAX_CONCURRENCY = 10
+
+# Sample CRD numbers to test with
+SAMPLE_CRD_NUMBERS = ["2841", "8361", "131940", "107488", "300903"]
+
+# CRD numbers that have been problematic
+PROBLEMATIC_CRD_NUMBERS = ["17409", "110966", "317700"]
+
+# Agents are shared across tests so their HTTP connection pools stay warm
+_AGENT_CACHE = {}
+
+def get_agent(agent_class, use_mock=False):
+    """Return a shared agent instance for the given class and mock mode."""
+    key = (agent_class, use_mock)
+    if key not in _AGENT_CACHE:
+        _AGENT_CACHE[key] = agent_class(use_mock=use_mock)
+    return _AGENT_CACHE[key]
+
+# One circuit breaker per agent, so a sustained outage of one service makes
+# further calls to it fail fast instead of waiting out every timeout
+_BREAKER_CACHE = {}
+
+def get_breaker(agent, fail_max=5, reset_timeout=10):
+    """Return the circuit breaker guarding calls to the given agent."""
+    key = id(agent)
+    if key not in _BREAKER_CACHE:
+        _BREAKER_CACHE[key] = CircuitBreaker(
+            fail_max=fail_max,
+            reset_timeout=reset_timeout,
+            name=type(agent).__name__
+        )
+    return _BREAKER_CACHE[key]
+
+# Successful lookups keyed by (agent id, CRD); the CRD -> firm mapping does not
+# change between iterations, so only misses and failures go back to the network
+_hits = {}
+
+def _cached_or_call(agent, crd, fetch, use_cache=True):
+    """
+    Return the cached result for crd, or call fetch(crd) and cache a truthy result.
+    
+    Args:
+        agent: Agent the lookup is made with, part of the cache key
+        crd: CRD number to look up
+        fetch: Function performing the actual lookup
+        use_cache: When False, always call fetch and leave the cache untouched
+        
+    Returns:
+        The lookup result
+    """
+    key = (id(agent), crd)
+    if use_cache and key in _hits:
+        logger.debug("Using cached result for CRD %s", crd)
+        return _hits[key]
+    result = fetch(crd)
+    if use_cache and result:
+        _hits[key] = result
+    return result
+
+# Transient errors worth retrying; the agents also wrap connection failures in
+# their own request error type, which callers add via retry(errors=...)
+RETRYABLE_ERRORS = (
+    ConnectionResetError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout
+)
+
+def retry(fn, *args, attempts=4, base=0.5, cap=30.0, on_retry=None, errors=RETRYABLE_ERRORS):
+    """
+    Call fn(*args), retrying transient errors with full-jitter exponential backoff.
     
-    agent = SECFirmIAPDAgent(use_mock=False)
-    results = {
-        "total_calls": 0,
-        "successful_calls": 0,
-        "failed_calls": 0,
-        "connection_resets": 0,
-        "other_errors": 0
-    }
+    Before retry n (0-based) the call sleeps a random time in
+    [0, min(cap, base * 2**n)] seconds.
     
-    for iteration in range(iterations):
-        logger.info(f"Starting iteration {iteration+1}/{iterations}")
+    Args:
+        fn: Function to call
+        *args: Arguments to pass to fn
+        attempts: Maximum number of attempts
+        base: Base backoff in seconds
+        cap: Maximum backoff in seconds
+        on_retry: Optional callback invoked with the error before each retry
+        errors: Exception types treated as transient
         
-        for crd in crd_numbers:
-            results["total_calls"] += 1
-            try:
-                logger.info(f"Searching for CRD: {crd}")
-                result = agent.search_firm_by_crd(crd)
-                
-                if result:
-                    logger.info(f"Successfully found CRD {crd}: {result.get('firm_name', 'Unknown')}")
-                    results["successful_calls"] += 1
-                else:
-                    logger.warning(f"No results found for CRD {crd}")
-                    results["failed_calls"] += 1
-                    
-            except ConnectionResetError:
-                logger.error(f"Connection reset error for CRD {crd}")
-                results["connection_resets"] += 1
-                results["failed_calls"] += 1
-                
-            except Exception as e:
-                logger.error(f"Error searching for CRD {crd}: {str(e)}")
-                results["other_errors"] += 1
-                results["failed_calls"] += 1
-                
-            # Add delay between calls
-            time.sleep(delay)
+    Returns:
+        The result of fn; the last error is re-raised once attempts are exhausted
+    """
+    for attempt in range(attempts):
+        try:
+            return fn(*args)
+        except errors as e:
+            if attempt == attempts - 1:
+                raise
+            if on_retry:
+                on_retry(e)
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+def create_limiter(delay, rps=None):
+    """
+    Create a token-bucket limiter for agent calls.
     
-    # Calculate success rate
-    success_rate = (results["successful_calls"] / results["total_calls"]) * 100 if results["total_calls"] > 0 else 0
+    Args:
+        delay: Average delay between calls in seconds, used when rps is not set
+        rps: Maximum requests per second; overrides delay when given
+        
+    Returns:
+        TokenBucket allowing up to one second's worth of burst, or None if unlimited
+    """
+    rate = rps if rps else (1.0 / delay if delay > 0 else None)
+    if not rate:
+        return None
+    return TokenBucket(rate=rate, capacity=max(1.0, rate))
+
+async def search_all(agent, crd_numbers, limiter=None, on_retry=None, use_cache=True,
+                     errors=RETRYABLE_ERRORS):
+    """
+    Search all CRD numbers concurrently with a blocking agent.
     
-    logger.info(f"SEC Agent Test Results:")
-    logger.info(f"Total calls: {results['total_calls']}")
-    logger.info(f"Successful calls: {results['successful_calls']}")
-    logger.info(f"Failed calls: {results['failed_calls']}")
-    logger.info(f"Connection resets: {results['connection_resets']}")
-    logger.info(f"Other errors: {results['other_errors']}")
-    logger.info(f"Success rate: {success_rate:.2f}%")
+    Each lookup runs in the default executor, bounded by MAX_CONCURRENCY, and
+    transient errors are retried with jittered backoff. Calls go through the
+    agent's circuit breaker; once it opens, remaining lookups fail fast with
+    CircuitBreakerError. With use_cache, CRDs already found in an earlier
+    iteration are answered from the cache.
     
-    return results
+    Returns:
+        List of results (or raised exceptions) in the same order as crd_numbers
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    breaker = get_breaker(agent)
+    
+    def attempt(crd):
+        if limiter:
+            limiter.take()
+        return breaker.call(agent.search_firm_by_crd, crd)
+    
+    def call(crd):
+        logger.debug("Searching for CRD: %s", crd)
+        
+        def log_retry(error):
+            logger.warning("Retrying CRD %s after transient error: %s", crd, error)
+            if on_retry:
+                on_retry(crd)
+        
+        return _cached_or_call(
+            agent, crd, lambda c: retry(attempt, c, on_retry=log_retry, errors=errors), use_cache
+        )
+    
+    async def bounded_call(crd):
+        async with semaphore:
+            return await loop.run_in_executor(None, call, crd)
+    
+    return await asyncio.gather(*(bounded_call(crd) for crd in crd_numbers), return_exceptions=True)
 
-def test_finra_agent(crd_numbers, iterations=3, delay=1.0):
-    """Test the FINRA agent with multiple CRD numbers."""
-    logger.info(f"Testing FINRA agent with {len(crd_numbers)} CRD numbers, {iterations} iterations each")
+def run_agent_test(agent, label, crd_numbers, iterations=3, delay=1.0, rps=None, use_cache=True,
+                   errors=RETRYABLE_ERRORS):
+    """
+    Run the resilience test for one agent.
+    
+    Args:
+        agent: Agent instance to test
+        label: Name of the agent used in log messages
+        crd_numbers: CRD numbers to look up
+        iterations: Number of times each CRD number is looked up
+        delay: Average delay between API calls in seconds
+        rps: Maximum requests per second; overrides delay when set
+        use_cache: Reuse successful lookups from earlier iterations
+        errors: Exception types treated as transient and retried
+        
+    Returns:
+        Counter of call outcomes keyed by total_calls, successful_calls, etc.
+    """
+    logger.info("Testing %s agent with %s CRD numbers, %s iterations each", label, len(crd_numbers), iterations)
+    
+    results = Counter()
     
-    agent = FinraFirmBrokerCheckAgent(use_mock=False)
-    results = {
-        "total_calls": 0,
-        "successful_calls": 0,
-        "failed_calls": 0,
-        "connection_resets": 0,
-        "other_errors": 0
-    }
+    limiter = create_limiter(delay, rps)
     
     for iteration in range(iterations):
-        logger.info(f"Starting iteration {iteration+1}/{iterations}")
+        logger.info("Starting iteration %s/%s", iteration+1, iterations)
         
-        for crd in crd_numbers:
-            results["total_calls"] += 1
-            try:
-                logger.info(f"Searching for CRD: {crd}")
-                result = agent.search_firm_by_crd(crd)
-                
-                if result:
-                    logger.info(f"Successfully found CRD {crd}")
-                    results["successful_calls"] += 1
-                else:
-                    logger.warning(f"No results found for CRD {crd}")
-                    results["failed_calls"] += 1
-                    
-            except ConnectionResetError:
-                logger.error(f"Connection reset error for CRD {crd}")
-                results["connection_resets"] += 1
-                results["failed_calls"] += 1
-                
-            except Exception as e:
-                logger.error(f"Error searching for CRD {crd}: {str(e)}")
-                results["other_errors"] += 1
-                results["failed_calls"] += 1
-                
-            # Add delay between calls
-            time.sleep(delay)
+        # Dispatch all CRD lookups for this iteration concurrently
+        retried = []
+        outcomes = asyncio.run(search_all(agent, crd_numbers, limiter, on_retry=retried.append,
+                                          use_cache=use_cache, errors=errors))
+        
+        # Tally this iteration's outcomes locally and merge them once
+        events = ["retried_calls"] * len(retried)
+        for crd, result in zip(crd_numbers, outcomes):
+            events.append("total_calls")
+            if isinstance(result, ConnectionResetError):
+                logger.error("Connection reset error for CRD %s", crd)
+                events += ("connection_resets", "failed_calls")
+            elif isinstance(result, CircuitBreakerError):
+                logger.warning("Circuit open, fast-failed CRD %s", crd)
+                events += ("fast_failed", "failed_calls")
+            elif isinstance(result, Exception):
+                logger.error("Error searching for CRD %s: %s", crd, result)
+                events += ("other_errors", "failed_calls")
+            elif result:
+                logger.info("Successfully found CRD %s: %s", crd, result.get('firm_name', 'Unknown'))
+                events.append("successful_calls")
+            else:
+                logger.warning("No results found for CRD %s", crd)
+                events.append("failed_calls")
+        results.update(events)
     
     # Calculate success rate
     success_rate = (results["successful_calls"] / results["total_calls"]) * 100 if results["total_calls"] > 0 else 0
     
-    logger.info(f"FINRA Agent Test Results:")
-    logger.info(f"Total calls: {results['total_calls']}")
-    logger.info(f"Successful calls: {results['successful_calls']}")
-    logger.info(f"Failed calls: {results['failed_calls']}")
-    logger.info(f"Connection resets: {results['connection_resets']}")
-    logger.info(f"Other errors: {results['other_errors']}")
-    logger.info(f"Success rate: {success_rate:.2f}%")
+    logger.info(
+        "%s Agent Test Results:\n"
+        "  Total calls: %d\n"
+        "  Successful calls: %d\n"
+        "  Failed calls: %d\n"
+        "  Connection resets: %d\n"
+        "  Other errors: %d\n"
+        "  Retried calls: %d\n"
+        "  Fast-failed calls: %d\n"
+        "  Success rate: %.2f%%",
+        label, results['total_calls'], results['successful_calls'], results['failed_calls'],
+        results['connection_resets'], results['other_errors'], results['retried_calls'],
+        results['fast_failed'], success_rate
+    )
     
     return results
 
+def test_sec_agent(crd_numbers, iterations=3, delay=1.0, rps=None, use_cache=True):
+    """Test the SEC agent with multiple CRD numbers."""
+    from agents.sec_firm_iapd_agent import SECFirmIAPDAgent, SECRequestError
+    
+    return run_agent_test(get_agent(SECFirmIAPDAgent), "SEC", crd_numbers, iterations, delay, rps,
+                          use_cache, errors=RETRYABLE_ERRORS + (SECRequestError,))
+
+def test_finra_agent(crd_numbers, iterations=3, delay=1.0, rps=None, use_cache=True):
+    """Test the FINRA agent with multiple CRD numbers."""
+    from agents.finra_firm_broker_check_agent import FinraFirmBrokerCheckAgent, FinraRequestError
+    
+    return run_agent_test(get_agent(FinraFirmBrokerCheckAgent), "FINRA", crd_numbers, iterations, delay, rps,
+                          use_cache, errors=RETRYABLE_ERRORS + (FinraRequestError,))
+
+def configure_logging():
+    """
+    Configure console logging for a script run.
+    
+    Records are written to the console by a background listener thread so log
+    output never blocks the threads making API calls. Called only when the
+    script is run directly, so importing the module leaves logging untouched.
+    
+    Returns:
+        The started QueueListener; stop it to flush the remaining records
+    """
+    log_queue = queue.Queue(-1)
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, console_handler)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    return listener
+
 def main():
     """Main entry point for the test script."""
     parser = argparse.ArgumentParser(description="Test connection resilience for SEC and FINRA agents")
     
+    parser.add_argument(
+        "--specific-cases",
+        action="store_true",
+        help="Test only the specific problematic CRD numbers"
+    )
+    
     parser.add_argument(
         "--sec-only",
         action="store_true",
@@ -161,95 +325,121 @@ def main():
     parser.add_argument(
         "--delay",
         type=float,
-        default=1.0,
-        help="Delay between API calls in seconds (default: 1.0)"
+        default=None,
+        help="Average delay between API calls in seconds; calls within an iteration run concurrently "
+             "(default: 1.0, or 2.0 with --specific-cases)"
+    )
+    
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=None,
+        help="Maximum API requests per second; overrides --delay when set"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Repeat every lookup on each iteration instead of reusing successful results"
     )
     
     args = parser.parse_args()
     
-    # Sample CRD numbers to test with
-    crd_numbers = ["2841", "8361", "131940", "107488", "300903"]
+    if args.specific_cases:
+        test_specific_cases(PROBLEMATIC_CRD_NUMBERS, 2.0 if args.delay is None else args.delay)
+        return
+    
+    crd_numbers = SAMPLE_CRD_NUMBERS
+    if args.delay is None:
+        args.delay = 1.0
     
     if not args.sec_only and not args.finra_only:
         # Test both agents
-        sec_results = test_sec_agent(crd_numbers, args.iterations, args.delay)
-        finra_results = test_finra_agent(crd_numbers, args.iterations, args.delay)
+        sec_results = test_sec_agent(crd_numbers, args.iterations, args.delay, args.rps, not args.no_cache)
+        finra_results = test_finra_agent(crd_numbers, args.iterations, args.delay, args.rps, not args.no_cache)
         
         # Compare results
         sec_success_rate = (sec_results["successful_calls"] / sec_results["total_calls"]) * 100 if sec_results["total_calls"] > 0 else 0
         finra_success_rate = (finra_results["successful_calls"] / finra_results["total_calls"]) * 100 if finra_results["total_calls"] > 0 else 0
         
-        logger.info("\nComparison of Results:")
-        logger.info(f"SEC Agent Success Rate: {sec_success_rate:.2f}%")
-        logger.info(f"FINRA Agent Success Rate: {finra_success_rate:.2f}%")
+        logger.info(
+            "\nComparison of Results:\n"
+            "  SEC Agent Success Rate: %.2f%%\n"
+            "  FINRA Agent Success Rate: %.2f%%",
+            sec_success_rate, finra_success_rate
+        )
         
     elif args.sec_only:
         # Test only SEC agent
-        test_sec_agent(crd_numbers, args.iterations, args.delay)
+        test_sec_agent(crd_numbers, args.iterations, args.delay, args.rps, not args.no_cache)
         
     elif args.finra_only:
         # Test only FINRA agent
-        test_finra_agent(crd_numbers, args.iterations, args.delay)
+        test_finra_agent(crd_numbers, args.iterations, args.delay, args.rps, not args.no_cache)
 
-def test_specific_cases():
-    """Test specific CRD numbers that have been problematic."""
+def test_specific_cases(crd_numbers=PROBLEMATIC_CRD_NUMBERS, delay=2.0):
+    """Test specific CRD numbers that have been problematic, starting calls at most every delay seconds."""
     logger.info("Testing specific problematic CRD numbers")
     
-    # Problematic CRD numbers
-    crd_numbers = ["17409", "110966", "317700"]
-    
     # Test SEC agent
     logger.info("Testing SEC agent with problematic CRD numbers")
-    sec_agent = SECFirmIAPDAgent(use_mock=False)
+    from agents.sec_firm_iapd_agent import SECFirmIAPDAgent, SECRequestError
+    sec_agent = get_agent(SECFirmIAPDAgent)
+    sec_breaker = get_breaker(sec_agent)
     
     for crd in crd_numbers:
+        started = time.perf_counter()
         try:
-            logger.info(f"Searching for CRD: {crd}")
-            result = sec_agent.search_firm_by_crd(crd)
+            logger.info("Searching for CRD: %s", crd)
+            result = retry(sec_breaker.call, sec_agent.search_firm_by_crd, crd,
+                           errors=RETRYABLE_ERRORS + (SECRequestError,))
             
             if result:
-                logger.info(f"Successfully found CRD {crd}: {result.get('firm_name', 'Unknown')}")
+                logger.info("Successfully found CRD %s: %s", crd, result.get('firm_name', 'Unknown'))
             else:
-                logger.warning(f"No results found for CRD {crd}")
+                logger.warning("No results found for CRD %s", crd)
                 
+        except CircuitBreakerError:
+            # Breaker is open; skip the pause since no request was made
+            logger.warning("Circuit open, fast-failed CRD %s", crd)
+            continue
         except Exception as e:
-            logger.error(f"Error searching for CRD {crd}: {str(e)}")
+            logger.error("Error searching for CRD %s: %s", crd, e)
             
-        # Add delay between calls
-        time.sleep(2.0)
+        # Pace calls delay seconds apart, counting the time the call itself took
+        time.sleep(max(0.0, delay - (time.perf_counter() - started)))
     
     # Test FINRA agent
     logger.info("\nTesting FINRA agent with problematic CRD numbers")
-    finra_agent = FinraFirmBrokerCheckAgent(use_mock=False)
+    from agents.finra_firm_broker_check_agent import FinraFirmBrokerCheckAgent, FinraRequestError
+    finra_agent = get_agent(FinraFirmBrokerCheckAgent)
+    finra_breaker = get_breaker(finra_agent)
     
     for crd in crd_numbers:
+        started = time.perf_counter()
         try:
-            logger.info(f"Searching for CRD: {crd}")
-            result = finra_agent.search_firm_by_crd(crd)
+            logger.info("Searching for CRD: %s", crd)
+            result = retry(finra_breaker.call, finra_agent.search_firm_by_crd, crd,
+                           errors=RETRYABLE_ERRORS + (FinraRequestError,))
             
             if result:
-                logger.info(f"Successfully found CRD {crd}")
+                logger.info("Successfully found CRD %s", crd)
             else:
-                logger.warning(f"No results found for CRD {crd}")
+                logger.warning("No results found for CRD %s", crd)
                 
+        except CircuitBreakerError:
+            # Breaker is open; skip the pause since no request was made
+            logger.warning("Circuit open, fast-failed CRD %s", crd)
+            continue
         except Exception as e:
-            logger.error(f"Error searching for CRD {crd}: {str(e)}")
+            logger.error("Error searching for CRD %s: %s", crd, e)
             
-        # Add delay between calls
-        time.sleep(2.0)
+        # Pace calls delay seconds apart, counting the time the call itself took
+        time.sleep(max(0.0, delay - (time.perf_counter() - started)))
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Test connection resilience for SEC and FINRA agents")
-    
-    parser.add_argument(
-        "--specific-cases",
-        action="store_true",
-        help="Test only the specific problematic CRD numbers"
-    )
-    
-    args, unknown = parser.parse_known_args()
-    
-    if args.specific_cases:
-        test_specific_cases()
-    else:
-        main()
\ No newline at end of file
+    log_listener = configure_logging()
+    try:
+        main()
+    finally:
+        log_listener.stop()
@@ -6,6 +6,12 @@ This script tests the new format of disclosures with disclosureType and disclosu
 
 import json
 import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from evaluation.firm_evaluation_processor import evaluate_disclosures, Alert, AlertSeverity
 from utils.logging_config import setup_logging
 
@@ -54,17 +60,23 @@ def main():
     business_name = "TEST FIRM"
     
     print("\n=== Test Case 1: New Format ===")
-    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_new_format, business_name)
+    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_new_format, business_name, format_hint="typed_counts")
     print_results(compliant, explanation, alerts)
     
     print("\n=== Test Case 2: Old Format ===")
-    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_old_format, business_name)
+    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_old_format, business_name, format_hint="status_list")
     print_results(compliant, explanation, alerts)
     
     print("\n=== Test Case 3: Empty Disclosures ===")
-    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_empty, business_name)
+    compliant, explanation, alerts = evaluate_disclosures(test_disclosures_empty, business_name, format_hint="empty")
     print_results(compliant, explanation, alerts)
 
+def format_metadata(metadata):
+    """Format alert metadata as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(metadata, indent=2)
+
 def print_results(compliant, explanation, alerts):
     """Print the results of the evaluation."""
     print(f"Compliant: {compliant}")
@@ -72,7 +84,7 @@ def print_results(compliant, explanation, alerts):
     print("Alerts:")
     for alert in alerts:
         print(f"  - [{alert.severity.value}] {alert.alert_type}: {alert.description}")
-        print(f"    Metadata: {json.dumps(alert.metadata, indent=2)}")
+        print(f"    Metadata: {format_metadata(alert.metadata)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
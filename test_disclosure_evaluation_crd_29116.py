@@ -5,6 +5,7 @@ This script investigates why disclosures are not being properly flagged in the e
 """
 
 import sys
+import argparse
 import json
 from pathlib import Path
 import logging
@@ -16,14 +17,20 @@ sys.path.append(str(Path(__file__).parent))
 from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_disclosures
+from utils.report_io import dumps_report, save_report, write_stdout
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def main():
+def main(compress=True):
     """Test disclosure evaluation for BROOKSTONE SECURITIES, INC. (CRD 29116)."""
+    # Read the clock once for every timestamp in this run
+    now = datetime.now()
+    now_iso = now.isoformat()
+    now_date = now.strftime("%Y-%m-%d")
+    
     # Create facade
     facade = FirmServicesFacade()
     
@@ -37,20 +44,16 @@ def main():
     
     if firm_details:
         # Log disclosure flag from raw data
-        disclosure_flag = None
-        if 'raw_data' in firm_details and 'iaDisclosureFlag' in firm_details['raw_data']:
-            disclosure_flag = firm_details['raw_data']['iaDisclosureFlag']
-            logger.info(f"Disclosure flag from raw data: {disclosure_flag}")
-        elif 'raw_data' in firm_details and 'basicInformation' in firm_details['raw_data'] and 'iaDisclosureFlag' in firm_details['raw_data']['basicInformation']:
-            disclosure_flag = firm_details['raw_data']['basicInformation']['iaDisclosureFlag']
+        raw = firm_details.get('raw_data') or {}
+        disclosure_flag = raw.get('iaDisclosureFlag') or (raw.get('basicInformation') or {}).get('iaDisclosureFlag')
+        if disclosure_flag is not None:
             logger.info(f"Disclosure flag from raw data: {disclosure_flag}")
         
         # Check SEC search result for disclosure flag
-        if 'sec_search_result' in firm_details and 'firm_ia_disclosure_fl' in firm_details['sec_search_result']:
-            sec_disclosure_flag = firm_details['sec_search_result']['firm_ia_disclosure_fl']
+        sec_disclosure_flag = (firm_details.get('sec_search_result') or {}).get('firm_ia_disclosure_fl')
+        if sec_disclosure_flag is not None:
             logger.info(f"Disclosure flag from SEC search result: {sec_disclosure_flag}")
-            if disclosure_flag is None:
-                disclosure_flag = sec_disclosure_flag
+        disclosure_flag = disclosure_flag or sec_disclosure_flag
         
         # Check if disclosures are present in the firm details
         if 'disclosures' in firm_details:
@@ -85,7 +88,7 @@ def main():
             report["claim"] = claim
             
             # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
+            report["generated_at"] = now_iso
             
             # Check disclosure evaluation in the report
             if 'disclosure_review' in report:
@@ -97,9 +100,9 @@ def main():
                 business_name = report.get('entity', {}).get('firm_name', 'Unknown')
                 
                 # Check if disclosure flag is present but disclosures are missing
-                disclosure_flag = None
-                if 'sec_search_result' in report['search_evaluation'] and 'firm_ia_disclosure_fl' in report['search_evaluation']['sec_search_result']:
-                    disclosure_flag = report['search_evaluation']['sec_search_result']['firm_ia_disclosure_fl']
+                sec_search_result = report['search_evaluation'].get('sec_search_result') or {}
+                disclosure_flag = sec_search_result.get('firm_ia_disclosure_fl')
+                if disclosure_flag is not None:
                     logger.info(f"Disclosure flag in report: {disclosure_flag}")
                 
                 # Get disclosures from firm data
@@ -112,7 +115,7 @@ def main():
                     finra_disclosures = [
                         {
                             "type": "Regulatory",
-                            "date": datetime.now().strftime("%Y-%m-%d"),
+                            "date": now_date,
                             "status": "UNRESOLVED",
                             "description": "Mock FINRA disclosure for testing"
                         }
@@ -137,19 +140,21 @@ def main():
             else:
                 logger.warning("No disclosure_review in report")
             
-            # Save the report to a file
-            output_file = f"compliance_report_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            # Serialize once, then save and print the same bytes
+            data = dumps_report(report)
+            output_file = save_report(data, f"compliance_report_{crd_number}.json", compress)
             
             logger.info(f"Compliance report saved to {output_file}")
             
             # Print the report
-            print(json.dumps(report, indent=2, default=str))
+            write_stdout(data)
         else:
             logger.error("Failed to generate compliance report")
     else:
         logger.error(f"No firm found with CRD: {crd_number}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Test disclosure evaluation for CRD 29116")
+    parser.add_argument("--no-gzip", action="store_true", help="Save the report as plain JSON instead of .json.gz")
+    args = parser.parse_args()
+    main(compress=not args.no_gzip)
\ No newline at end of file
@@ -4,10 +4,10 @@ Test script to verify source listings for FINRA-regulated entities.
 """
 
 import sys
-import json
+import argparse
 from pathlib import Path
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
@@ -15,17 +15,15 @@ sys.path.append(str(Path(__file__).parent))
 from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
+from utils.report_io import RUN_STARTED_AT, dumps_report, save_report
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def test_entity(crd_number, entity_name):
+def test_entity(facade, crd_number, entity_name, compress=True):
     """Generate a compliance report for a firm with the given CRD number and verify source listing."""
-    # Create facade
-    facade = FirmServicesFacade()
-    
     # Search parameters
     subject_id = f"test_subject_{crd_number}"
     
@@ -56,13 +54,11 @@ def test_entity(crd_number, entity_name):
             # Add the claim to the report
             report["claim"] = claim
             
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
+            # Add timestamp, shared by every entity in this run
+            report["generated_at"] = RUN_STARTED_AT
             
             # Save the report to a file
-            output_file = f"compliance_report_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            output_file = save_report(dumps_report(report), f"compliance_report_{crd_number}.json", compress)
             
             logger.info(f"Compliance report saved to {output_file}")
             
@@ -104,7 +100,7 @@ def test_entity(crd_number, entity_name):
     
     return None
 
-def main():
+def main(compress=True):
     """Test source listings for specific FINRA-regulated entities."""
     # List of entities to test
     entities = [
@@ -113,11 +109,24 @@ def main():
         {"crd": "100960", "name": "OUTCOME CAPITAL, LLC"}
     ]
     
-    results = []
-    for entity in entities:
-        result = test_entity(entity["crd"], entity["name"])
-        if result:
-            results.append(result)
+    # One facade for all entities: the workers share its connection pools and
+    # take turns on its service-level delay, which is applied under a lock
+    facade = FirmServicesFacade()
+    
+    # Entities are independent, so test them concurrently
+    completed = {}
+    with ThreadPoolExecutor(max_workers=len(entities)) as executor:
+        futures = {
+            executor.submit(test_entity, facade, entity["crd"], entity["name"], compress): index
+            for index, entity in enumerate(entities)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                completed[futures[future]] = result
+    
+    # Keep the summary in the original entity order
+    results = [completed[index] for index in sorted(completed)]
     
     # Print summary
     print("\nTest Results Summary:")
@@ -133,4 +142,7 @@ def main():
         print("-" * 80)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Verify source listings for FINRA-regulated entities")
+    parser.add_argument("--no-gzip", action="store_true", help="Save reports as plain JSON instead of .json.gz")
+    args = parser.parse_args()
+    main(compress=not args.no_gzip)
\ No newline at end of file
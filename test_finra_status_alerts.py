@@ -6,10 +6,13 @@ are still showing status alerts in compliance reports.
 """
 
 import sys
-import json
 from pathlib import Path
 import logging
-from datetime import datetime
+from dataclasses import dataclass
+from collections import namedtuple
+from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
@@ -17,22 +20,65 @@ sys.path.append(str(Path(__file__).parent))
 from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
+from utils.report_io import RUN_STARTED_AT, stream_report
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def test_entity(crd_number, entity_name):
+# Defaults for alert fields missing from a report's alert dictionaries
+_K_AT, _K_SEV, _K_DESC, _K_CAT, _K_MD = map(
+    sys.intern, ("alert_type", "severity", "description", "alert_category", "metadata")
+)
+_ALERT_DEFAULTS = {
+    _K_AT: 'Unknown',
+    _K_SEV: 'Unknown',
+    _K_DESC: 'No description',
+    _K_CAT: 'Unknown',
+    _K_MD: {}
+}
+
+@dataclass(slots=True, frozen=True)
+class EntityResult:
+    """Status-alert findings for one tested entity."""
+    entity_name: str
+    crd_number: str
+    registration_status: str
+    firm_status: str
+    is_finra_registered: bool
+    is_sec_registered: bool
+    has_status_alerts: bool
+    status_alerts: List[Dict[str, Any]]
+    compliance_explanation: str
+
+Entity = namedtuple("Entity", "crd name")
+
+# Entities to test
+_ENTITIES = (
+    Entity("40290", "GREENHILL & CO., LLC"),
+    Entity("47936", "Martinwolf"),
+    Entity("17409", "Martinson & Company, LTD."),
+    Entity("100960", "OUTCOME CAPITAL, LLC"),
+    Entity("284175", "Gordon Dyal & Co., LLC")
+)
+
+@lru_cache(maxsize=1)
+def _get_facade():
+    """Create the facade on first use and share it across entities."""
+    return FirmServicesFacade()
+
+def test_entity(crd_number, entity_name, facade=None):
     """Generate a compliance report for a firm with the given CRD number and analyze status alerts."""
-    # Create facade
-    facade = FirmServicesFacade()
+    # Use the shared facade unless the caller supplies one
+    if facade is None:
+        facade = _get_facade()
     
     # Search parameters
     subject_id = f"test_subject_{crd_number}"
     
     # Search for firm by CRD
-    logger.info(f"Searching for firm with CRD: {crd_number} ({entity_name})")
+    logger.info("Searching for firm with CRD: %s (%s)", crd_number, entity_name)
     firm_details = facade.search_firm_by_crd(subject_id, crd_number)
     
     if firm_details:
@@ -40,10 +86,10 @@ def test_entity(crd_number, entity_name):
         if 'finra_search_result' in firm_details:
             finra_result = firm_details.get('finra_search_result', {})
             logger.info("FINRA search result:")
-            logger.info(f"  - firm_name: {finra_result.get('firm_name', 'Not found')}")
-            logger.info(f"  - crd_number: {finra_result.get('crd_number', 'Not found')}")
-            logger.info(f"  - registration_status: {finra_result.get('registration_status', 'Not found')}")
-            logger.info(f"  - firm_status: {finra_result.get('firm_status', 'Not found')}")
+            logger.info("  - firm_name: %s", finra_result.get('firm_name', 'Not found'))
+            logger.info("  - crd_number: %s", finra_result.get('crd_number', 'Not found'))
+            logger.info("  - registration_status: %s", finra_result.get('registration_status', 'Not found'))
+            logger.info("  - firm_status: %s", finra_result.get('firm_status', 'Not found'))
         
         # Create a claim for processing
         claim = {
@@ -54,7 +100,7 @@ def test_entity(crd_number, entity_name):
         }
         
         # Process the claim to generate a compliance report
-        logger.info(f"Generating compliance report for {entity_name} (CRD: {crd_number})")
+        logger.info("Generating compliance report for %s (CRD: %s)", entity_name, crd_number)
         report = process_claim(
             claim=claim,
             facade=facade,
@@ -67,15 +113,15 @@ def test_entity(crd_number, entity_name):
             # Add the claim to the report
             report["claim"] = claim
             
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
+            # Add timestamp; the run's start time, shared by every report in the batch
+            report["generated_at"] = RUN_STARTED_AT
             
-            # Save the report to a file
+            # Save the report to a file section by section, so firms with long
+            # alert lists do not need the whole report encoded in memory
             output_file = f"compliance_report_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            stream_report(report, output_file)
             
-            logger.info(f"Compliance report saved to {output_file}")
+            logger.info("Compliance report saved to %s", output_file)
             
             # Check for status alerts
             status_evaluation = report.get("status_evaluation", {})
@@ -91,32 +137,33 @@ def test_entity(crd_number, entity_name):
             is_sec_registered = entity_section.get("is_sec_registered", False)
             
             # Log detailed information
-            logger.info(f"Entity: {entity_name}")
-            logger.info(f"CRD: {crd_number}")
-            logger.info(f"Registration Status: {registration_status}")
-            logger.info(f"Firm Status: {firm_status}")
-            logger.info(f"Is FINRA Registered: {is_finra_registered}")
-            logger.info(f"Is SEC Registered: {is_sec_registered}")
-            logger.info(f"Status Compliance: {compliance}")
-            logger.info(f"Status Compliance Explanation: {compliance_explanation}")
-            logger.info(f"Has Status Alerts: {len(alerts) > 0}")
+            logger.info("Entity: %s", entity_name)
+            logger.info("CRD: %s", crd_number)
+            logger.info("Registration Status: %s", registration_status)
+            logger.info("Firm Status: %s", firm_status)
+            logger.info("Is FINRA Registered: %s", is_finra_registered)
+            logger.info("Is SEC Registered: %s", is_sec_registered)
+            logger.info("Status Compliance: %s", compliance)
+            logger.info("Status Compliance Explanation: %s", compliance_explanation)
+            logger.info("Has Status Alerts: %s", len(alerts) > 0)
             
-            # Log detailed alert information
-            if alerts:
+            # Log detailed alert information; skipped entirely when INFO is disabled
+            if alerts and logger.isEnabledFor(logging.INFO):
                 logger.info("Status Alerts:")
                 for i, alert in enumerate(alerts, 1):
-                    logger.info(f"  Alert {i}:")
-                    logger.info(f"    Type: {alert.get('alert_type', 'Unknown')}")
-                    logger.info(f"    Severity: {alert.get('severity', 'Unknown')}")
-                    logger.info(f"    Description: {alert.get('description', 'No description')}")
-                    logger.info(f"    Category: {alert.get('alert_category', 'Unknown')}")
+                    a = {**_ALERT_DEFAULTS, **alert}
+                    logger.info("  Alert %s:", i)
+                    logger.info("    Type: %s", a[_K_AT])
+                    logger.info("    Severity: %s", a[_K_SEV])
+                    logger.info("    Description: %s", a[_K_DESC])
+                    logger.info("    Category: %s", a[_K_CAT])
                     
                     # Log metadata if available
-                    metadata = alert.get('metadata', {})
+                    metadata = a[_K_MD]
                     if metadata:
-                        logger.info(f"    Metadata:")
+                        logger.info("    Metadata:")
                         for key, value in metadata.items():
-                            logger.info(f"      {key}: {value}")
+                            logger.info("      %s: %s", key, value)
             
             # Check raw data for registration information
             basic_result = report.get("search_evaluation", {}).get("basic_result", {})
@@ -124,64 +171,62 @@ def test_entity(crd_number, entity_name):
             if raw_data:
                 basic_info = raw_data.get("basicInformation", {})
                 logger.info("Raw Registration Data:")
-                logger.info(f"  FINRA Registered: {basic_info.get('finraRegistered', 'N/A')}")
-                logger.info(f"  Firm Status: {basic_info.get('firmStatus', 'N/A')}")
-                logger.info(f"  Regulator: {basic_info.get('regulator', 'N/A')}")
-                logger.info(f"  BC Scope: {basic_info.get('bcScope', 'N/A')}")
-                logger.info(f"  IA Scope: {basic_info.get('iaScope', 'N/A')}")
+                logger.info("  FINRA Registered: %s", basic_info.get('finraRegistered', 'N/A'))
+                logger.info("  Firm Status: %s", basic_info.get('firmStatus', 'N/A'))
+                logger.info("  Regulator: %s", basic_info.get('regulator', 'N/A'))
+                logger.info("  BC Scope: %s", basic_info.get('bcScope', 'N/A'))
+                logger.info("  IA Scope: %s", basic_info.get('iaScope', 'N/A'))
             
-            return {
-                "entity_name": entity_name,
-                "crd_number": crd_number,
-                "registration_status": registration_status,
-                "firm_status": firm_status,
-                "is_finra_registered": is_finra_registered,
-                "is_sec_registered": is_sec_registered,
-                "has_status_alerts": len(alerts) > 0,
-                "status_alerts": alerts,
-                "compliance_explanation": compliance_explanation
-            }
+            return EntityResult(
+                entity_name=entity_name,
+                crd_number=crd_number,
+                registration_status=registration_status,
+                firm_status=firm_status,
+                is_finra_registered=is_finra_registered,
+                is_sec_registered=is_sec_registered,
+                has_status_alerts=len(alerts) > 0,
+                status_alerts=alerts,
+                compliance_explanation=compliance_explanation
+            )
         else:
             logger.error("Failed to generate compliance report")
     else:
-        logger.error(f"No firm found with CRD: {crd_number}")
+        logger.error("No firm found with CRD: %s", crd_number)
     
     return None
 
 def main():
     """Test status alerts for specific FINRA-regulated entities."""
-    # List of entities to test
-    entities = [
-        {"crd": "40290", "name": "GREENHILL & CO., LLC"},
-        {"crd": "47936", "name": "Martinwolf"},
-        {"crd": "17409", "name": "Martinson & Company, LTD."},
-        {"crd": "100960", "name": "OUTCOME CAPITAL, LLC"},
-        {"crd": "284175", "name": "Gordon Dyal & Co., LLC"}
-    ]
-    
-    results = []
-    for entity in entities:
-        result = test_entity(entity["crd"], entity["name"])
-        if result:
-            results.append(result)
+    # The lookups are I/O bound, so run them concurrently against one shared facade;
+    # its service-level delay is taken under a lock, so calls to FINRA/SEC stay
+    # spaced out even with several workers
+    facade = _get_facade()
+    with ThreadPoolExecutor(max_workers=len(_ENTITIES)) as executor:
+        outcomes = executor.map(lambda entity: test_entity(entity.crd, entity.name, facade), _ENTITIES)
+        results = [result for result in outcomes if result]
     
-    # Print summary
-    print("\nTest Results Summary:")
-    print("-" * 80)
+    # Print summary as a single write
+    lines = ["\nTest Results Summary:", "-" * 80]
     for result in results:
-        print(f"Entity: {result['entity_name']}")
-        print(f"CRD: {result['crd_number']}")
-        print(f"Registration Status: {result['registration_status']}")
-        print(f"Firm Status: {result['firm_status']}")
-        print(f"Is FINRA Registered: {result['is_finra_registered']}")
-        print(f"Is SEC Registered: {result['is_sec_registered']}")
-        print(f"Has Status Alerts: {result['has_status_alerts']}")
-        if result['has_status_alerts']:
-            print(f"Compliance Explanation: {result['compliance_explanation']}")
-            print("Status Alerts:")
-            for alert in result['status_alerts']:
-                print(f"  - {alert.get('alert_type', 'Unknown')}: {alert.get('description', 'No description')}")
-        print("-" * 80)
+        lines += [
+            f"Entity: {result.entity_name}",
+            f"CRD: {result.crd_number}",
+            f"Registration Status: {result.registration_status}",
+            f"Firm Status: {result.firm_status}",
+            f"Is FINRA Registered: {result.is_finra_registered}",
+            f"Is SEC Registered: {result.is_sec_registered}",
+            f"Has Status Alerts: {result.has_status_alerts}"
+        ]
+        if result.has_status_alerts:
+            lines.append(f"Compliance Explanation: {result.compliance_explanation}")
+            lines.append("Status Alerts:")
+            lines.extend(
+                f"  - {alert.get(_K_AT, 'Unknown')}: {alert.get(_K_DESC, 'No description')}"
+                for alert in result.status_alerts
+            )
+        lines.append("-" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,23 +6,25 @@ import unittest
 from unittest.mock import patch, MagicMock
 from services.firm_business import process_claim
 from services.firm_name_matcher import FirmNameMatcher
+from services.firm_services import FirmServicesFacade
 
 class TestFirmNameMatching(unittest.TestCase):
     """Test case for firm name matching with CRD."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.mock_facade = MagicMock()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the mock facade once for all tests."""
+        cls.mock_facade = MagicMock(spec=FirmServicesFacade)
         
         # Mock the search_firm_by_crd method to return a successful result
-        self.mock_facade.search_firm_by_crd.return_value = {
+        cls.mock_facade.search_firm_by_crd.return_value = {
             "firm_name": "Silver Oak Securities, Incorporated",
             "crd_number": "46947",
             "source": "FINRA"
         }
         
         # Mock the get_firm_details method to return a successful result
-        self.mock_facade.get_firm_details.return_value = {
+        cls.mock_facade.get_firm_details.return_value = {
             "firm_name": "Silver Oak Securities, Incorporated",
             "crd_number": "46947",
             "source": "FINRA",
@@ -32,7 +34,11 @@ class TestFirmNameMatching(unittest.TestCase):
         }
         
         # Mock the save_compliance_report method to return True
-        self.mock_facade.save_compliance_report.return_value = True
+        cls.mock_facade.save_compliance_report.return_value = True
+
+    def setUp(self):
+        """Clear call history left by earlier tests; return values are kept."""
+        self.mock_facade.reset_mock()
 
     def test_crd_match_with_incorrect_name(self):
         """Test that a claim with correct CRD but incorrect name succeeds."""
@@ -78,5 +84,29 @@ class TestFirmNameMatching(unittest.TestCase):
         # The similarity should be above the default threshold (0.75)
         self.assertGreaterEqual(similarity, 0.75)
 
+    def test_similarity_matrix(self):
+        """Test pairwise similarity between claimed and registered firm names."""
+        matcher = FirmNameMatcher()
+        threshold = 0.75
+        
+        claimed = ["Sliver Oak Securities Inc", "Gordon Dyal and Co LLC"]
+        registered = ["Silver Oak Securities, Incorporated", "Gordon Dyal & Co., LLC", "Martinwolf"]
+        
+        matrix = matcher.similarity_matrix(claimed, registered)
+        
+        self.assertEqual(len(matrix), len(claimed))
+        self.assertTrue(all(len(row) == len(registered) for row in matrix))
+        # Each claimed name matches its own registered name best
+        for i, row in enumerate(matrix):
+            self.assertEqual(row.index(max(row)), i)
+            self.assertGreaterEqual(row[i], threshold)
+        # Entries agree with the single-pair calculation
+        self.assertEqual(
+            matrix[0][0],
+            matcher._calculate_similarity(
+                matcher._normalize_name(claimed[0]), matcher._normalize_name(registered[0])
+            )
+        )
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
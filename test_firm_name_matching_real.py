@@ -9,9 +9,10 @@ from services.firm_services import FirmServicesFacade
 class TestFirmNameMatchingReal(unittest.TestCase):
     """Real-world test case for firm name matching with CRD."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.facade = FirmServicesFacade()
+    @classmethod
+    def setUpClass(cls):
+        """Set up a facade shared by all tests in the class."""
+        cls.facade = FirmServicesFacade()
 
     def test_real_crd_match_with_incorrect_name(self):
         """Test that a claim with correct CRD but incorrect name succeeds in a real scenario."""
@@ -14,18 +14,13 @@ import traceback
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
-# Set up logging to console
+# Set up logging to stdout so output is visible; a single root handler, so
+# records are not printed twice
 logging.basicConfig(level=logging.INFO,
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                   stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
-# Add console handler to ensure output is visible
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
 # Print directly to ensure output is visible
 print("Starting test script for fixes...")
 
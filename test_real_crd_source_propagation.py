@@ -7,9 +7,10 @@ section to the final_evaluation section in the firm compliance report using a re
 """
 
 import sys
+import argparse
 from pathlib import Path
-import json
 from datetime import datetime
+from functools import lru_cache
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
@@ -17,16 +18,27 @@ sys.path.append(str(Path(__file__).parent))
 from services.firm_services import FirmServicesFacade
 from evaluation.firm_evaluation_report_builder import FirmEvaluationReportBuilder
 from evaluation.firm_evaluation_report_director import FirmEvaluationReportDirector
+from utils.report_io import dumps_report, write_stdout
 
-def test_real_crd_source_propagation(crd_number="174196"):
-    """Test source field propagation with a real CRD number."""
+@lru_cache(maxsize=1)
+def _get_facade():
+    """Create the FirmServicesFacade on first use and share it across CRDs."""
+    return FirmServicesFacade()
+
+def test_real_crd_source_propagation(crd_number="174196", verbose=False):
+    """Test source field propagation with a real CRD number.
+
+    Args:
+        crd_number: CRD number of the firm to look up
+        verbose: Print the full final_evaluation section after the check
+    """
     print(f"Testing source field propagation with CRD {crd_number}...")
     
     # Create a reference ID for the test
     reference_id = f"TEST-CRD-{crd_number}"
     
-    # Create a FirmServicesFacade instance
-    facade = FirmServicesFacade()
+    # Reuse the shared FirmServicesFacade so its agents keep their HTTP sessions
+    facade = _get_facade()
     
     # Search for the firm by CRD number
     subject_id = f"TEST-{crd_number}"  # Create a test subject ID
@@ -94,11 +106,16 @@ def test_real_crd_source_propagation(crd_number="174196"):
         print("❌ FAILURE: Source field not found in final_evaluation")
     
     # Print the final_evaluation section for inspection
-    print("\nFinal Evaluation Section:")
-    print(json.dumps(report["final_evaluation"], indent=2))
+    if verbose:
+        print("\nFinal Evaluation Section:")
+        write_stdout(dumps_report(report["final_evaluation"]))
     
     return report
 
 if __name__ == "__main__":
-    # Test with CRD 174196 (GORDON FINANCIAL)
-    test_real_crd_source_propagation("174196")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Test source field propagation with a real CRD number")
+    parser.add_argument("--crd", default="174196", help="CRD number to test (default: 174196, GORDON FINANCIAL)")
+    parser.add_argument("--verbose", action="store_true", help="Print the final_evaluation section")
+    args = parser.parse_args()
+
+    test_real_crd_source_propagation(args.crd, verbose=args.verbose)
\ No newline at end of file
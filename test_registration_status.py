@@ -1,7 +1,10 @@
+import copy
 import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 # Add parent directory to Python path to import evaluation module
@@ -9,20 +12,145 @@ sys.path.append(str(Path(__file__).parent))
 
 from evaluation.firm_evaluation_processor import evaluate_registration_status
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('test_registration_status')
 
-def load_json_file(file_path):
-    """Load a JSON file and return its contents."""
+# Cache file layout for the 2025-07-06 snapshot; filled in per entity with str.format
+_REPORT_TMPL = "{cache}/{eid}/FirmComplianceReport_{eid}_v1_20250706.json"
+_SEC_TMPL = (
+    "{cache}/{eid}/SEC_FirmIAPD_Agent/search_firm_by_crd/search_crd_{crd}/"
+    "SEC_FirmIAPD_Agent_search_crd_{crd}_search_firm_by_crd_20250706.json"
+)
+_FINRA_TMPL = (
+    "{cache}/{eid}/FINRA_FirmBrokerCheck_Agent/search_firm_by_crd/search_crd_{crd}/"
+    "FINRA_FirmBrokerCheck_Agent_search_crd_{crd}_search_firm_by_crd_20250706.json"
+)
+
+# (source, path template, business_info key) for the search results merged into each report
+_SEARCH_RESULTS = (
+    ("SEC", _SEC_TMPL, "sec_search_result"),
+    ("FINRA", _FINRA_TMPL, "finra_search_result"),
+)
+
+@lru_cache(maxsize=256)
+def _load_json_cached(file_path, mtime):
+    """Parse a JSON file; cached per path and modification time."""
+    # One read of the whole file; both parsers accept bytes, so there is no
+    # text decoding layer in between
+    raw = Path(file_path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def load_json_file(file_path, mutable=False):
+    """
+    Load a JSON file and return its contents.
+    
+    Parsed files are cached until they change on disk. The cached object is
+    shared, so pass mutable=True to get a private copy that can be modified.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist; other errors are logged
+            and return None
+    """
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        data = _load_json_cached(str(file_path), os.path.getmtime(file_path))
+        return copy.deepcopy(data) if mutable else data
+    except FileNotFoundError:
+        raise
     except Exception as e:
-        logger.error(f"Error loading {file_path}: {e}")
+        logger.error("Error loading %s: %s", file_path, e)
         return None
 
+def _evaluate_entity(cache_dir, entity_id):
+    """
+    Load the cached data for one entity and evaluate its registration status.
+    
+    Runs on a worker thread, so nothing is logged here. Log lines are returned
+    as (level, message, args) tuples for the caller to emit in entity order.
+    """
+    lines = []
+    
+    def log(level, message, *args):
+        lines.append((level, message, args))
+    
+    log(logging.INFO, "Testing entity %s", entity_id)
+    
+    # Try to load the compliance report
+    report_path = _REPORT_TMPL.format(cache=cache_dir, eid=entity_id)
+    try:
+        # business_info from the report is modified below, so take a copy
+        report_data = load_json_file(report_path, mutable=True)
+    except FileNotFoundError:
+        log(logging.WARNING, "No compliance report found for %s", entity_id)
+        return lines
+    
+    if not report_data:
+        log(logging.WARNING, "Could not load compliance report for %s", entity_id)
+        return lines
+    
+    log(logging.INFO, "Found compliance report for %s", entity_id)
+    
+    # Extract business_info from the report
+    business_info = report_data.get("business_info") or {}
+    
+    # Check if there's a CRD number
+    crd_number = business_info.get("crd_number")
+    if crd_number:
+        log(logging.INFO, "CRD number for %s: %s", entity_id, crd_number)
+        
+        # Add the SEC and FINRA search results to business_info for testing
+        for source, template, key in _SEARCH_RESULTS:
+            try:
+                search_data = load_json_file(template.format(cache=cache_dir, eid=entity_id, crd=crd_number))
+            except FileNotFoundError:
+                continue
+            if not search_data:
+                continue
+            
+            log(logging.INFO, "Found %s search data for %s", source, entity_id)
+            business_info[key] = search_data
+    
+    # Now test the evaluate_registration_status function
+    log(logging.INFO, "Testing evaluate_registration_status for %s", entity_id)
+    is_compliant, explanation, alerts = evaluate_registration_status(business_info)
+    
+    # Log the result and any alerts
+    log(logging.INFO, "Registration status evaluation result for %s: %s", entity_id, is_compliant)
+    log(logging.INFO, "Explanation: %s", explanation)
+    if alerts:
+        log(logging.INFO, "Alerts for %s:", entity_id)
+        for alert in alerts:
+            log(logging.INFO, "  - %s", alert)
+    
+    # Check if firm_ia_scope was found and where
+    sec_result = business_info.get("sec_search_result") or {}
+    finra_result = business_info.get("finra_search_result") or {}
+    if "firm_ia_scope" in business_info:
+        log(logging.INFO, "firm_ia_scope found in main business_info: %s", business_info['firm_ia_scope'])
+    elif "firm_ia_scope" in sec_result:
+        log(logging.INFO, "firm_ia_scope found in sec_search_result: %s", sec_result['firm_ia_scope'])
+    elif "firm_ia_scope" in finra_result:
+        log(logging.INFO, "firm_ia_scope found in finra_search_result: %s", finra_result['firm_ia_scope'])
+    else:
+        log(logging.WARNING, "firm_ia_scope not found for %s", entity_id)
+    
+    # Check registration_status
+    if "registration_status" in business_info:
+        log(logging.INFO, "registration_status in main business_info: %s", business_info['registration_status'])
+    else:
+        log(logging.WARNING, "registration_status not found for %s", entity_id)
+    
+    log(logging.INFO, "-" * 50)
+    return lines
+
 def test_registration_status_evaluation():
     """Test the evaluate_registration_status function with real data."""
     
@@ -32,93 +160,12 @@ def test_registration_status_evaluation():
     # List of entity IDs to test
     entity_ids = ["EN-013069", "EN-013098", "EN-013111", "EN-013134"]
     
-    for entity_id in entity_ids:
-        logger.info(f"Testing entity {entity_id}")
-        
-        # Try to load the compliance report
-        report_path = os.path.join(cache_dir, entity_id, f"FirmComplianceReport_{entity_id}_v1_20250706.json")
-        if os.path.exists(report_path):
-            report_data = load_json_file(report_path)
-            if report_data:
-                logger.info(f"Found compliance report for {entity_id}")
-                
-                # Extract business_info from the report
-                business_info = report_data.get("business_info", {})
-                
-                # Check if there's a CRD number
-                crd_number = business_info.get("crd_number")
-                if crd_number:
-                    logger.info(f"CRD number for {entity_id}: {crd_number}")
-                    
-                    # Look for SEC search results
-                    sec_search_path = os.path.join(
-                        cache_dir, 
-                        entity_id, 
-                        "SEC_FirmIAPD_Agent", 
-                        "search_firm_by_crd", 
-                        f"search_crd_{crd_number}", 
-                        f"SEC_FirmIAPD_Agent_search_crd_{crd_number}_search_firm_by_crd_20250706.json"
-                    )
-                    
-                    if os.path.exists(sec_search_path):
-                        sec_search_data = load_json_file(sec_search_path)
-                        if sec_search_data:
-                            logger.info(f"Found SEC search data for {entity_id}")
-                            
-                            # Add SEC search result to business_info for testing
-                            business_info["sec_search_result"] = sec_search_data
-                    
-                    # Look for FINRA search results
-                    finra_search_path = os.path.join(
-                        cache_dir, 
-                        entity_id, 
-                        "FINRA_FirmBrokerCheck_Agent", 
-                        "search_firm_by_crd", 
-                        f"search_crd_{crd_number}", 
-                        f"FINRA_FirmBrokerCheck_Agent_search_crd_{crd_number}_search_firm_by_crd_20250706.json"
-                    )
-                    
-                    if os.path.exists(finra_search_path):
-                        finra_search_data = load_json_file(finra_search_path)
-                        if finra_search_data:
-                            logger.info(f"Found FINRA search data for {entity_id}")
-                            
-                            # Add FINRA search result to business_info for testing
-                            business_info["finra_search_result"] = finra_search_data
-                
-                # Now test the evaluate_registration_status function
-                logger.info(f"Testing evaluate_registration_status for {entity_id}")
-                is_compliant, explanation, alerts = evaluate_registration_status(business_info)
-                
-                # Log the result and any alerts
-                logger.info(f"Registration status evaluation result for {entity_id}: {is_compliant}")
-                logger.info(f"Explanation: {explanation}")
-                if alerts:
-                    logger.info(f"Alerts for {entity_id}:")
-                    for alert in alerts:
-                        logger.info(f"  - {alert}")
-                
-                # Check if firm_ia_scope was found and where
-                if "firm_ia_scope" in business_info:
-                    logger.info(f"firm_ia_scope found in main business_info: {business_info['firm_ia_scope']}")
-                elif "sec_search_result" in business_info and "firm_ia_scope" in business_info["sec_search_result"]:
-                    logger.info(f"firm_ia_scope found in sec_search_result: {business_info['sec_search_result']['firm_ia_scope']}")
-                elif "finra_search_result" in business_info and "firm_ia_scope" in business_info["finra_search_result"]:
-                    logger.info(f"firm_ia_scope found in finra_search_result: {business_info['finra_search_result']['firm_ia_scope']}")
-                else:
-                    logger.warning(f"firm_ia_scope not found for {entity_id}")
-                
-                # Check registration_status
-                if "registration_status" in business_info:
-                    logger.info(f"registration_status in main business_info: {business_info['registration_status']}")
-                else:
-                    logger.warning(f"registration_status not found for {entity_id}")
-                
-                logger.info("-" * 50)
-            else:
-                logger.warning(f"Could not load compliance report for {entity_id}")
-        else:
-            logger.warning(f"No compliance report found for {entity_id}")
+    # Entities are independent, so load and evaluate them in parallel; map()
+    # yields results in entity order and logging stays on this thread
+    with ThreadPoolExecutor(max_workers=min(8, len(entity_ids))) as executor:
+        for lines in executor.map(partial(_evaluate_entity, cache_dir), entity_ids):
+            for level, message, args in lines:
+                logger.log(level, message, *args)
 
 if __name__ == "__main__":
     test_registration_status_evaluation()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import logging
 import sys
+from collections import namedtuple
 from pathlib import Path
 
 # Add parent directory to Python path to import evaluation module
@@ -12,14 +13,16 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('test_registration_status')
 
+Case = namedtuple('Case', 'name data expected_result expected_location')
+
 def test_with_mock_data():
     """Test the evaluate_registration_status function with mock data."""
     
     # Test cases to verify the function correctly finds firm_ia_scope in different locations
     test_cases = [
-        {
-            "name": "Case 1: firm_ia_scope in main business_info",
-            "data": {
+        Case(
+            name="Case 1: firm_ia_scope in main business_info",
+            data={
                 "is_sec_registered": True,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -28,12 +31,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": True,
-            "expected_location": "main business_info"
-        },
-        {
-            "name": "Case 2: firm_ia_scope in sec_search_result",
-            "data": {
+            expected_result=True,
+            expected_location="main business_info"
+        ),
+        Case(
+            name="Case 2: firm_ia_scope in sec_search_result",
+            data={
                 "is_sec_registered": True,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -44,12 +47,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": True,
-            "expected_location": "sec_search_result"
-        },
-        {
-            "name": "Case 3: firm_ia_scope in finra_search_result",
-            "data": {
+            expected_result=True,
+            expected_location="sec_search_result"
+        ),
+        Case(
+            name="Case 3: firm_ia_scope in finra_search_result",
+            data={
                 "is_sec_registered": True,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -61,12 +64,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": True,
-            "expected_location": "finra_search_result"
-        },
-        {
-            "name": "Case 4: firm_ia_scope is INACTIVE",
-            "data": {
+            expected_result=True,
+            expected_location="finra_search_result"
+        ),
+        Case(
+            name="Case 4: firm_ia_scope is INACTIVE",
+            data={
                 "is_sec_registered": True,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -75,12 +78,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": True,  # Still compliant because registration_status is APPROVED
-            "expected_location": "main business_info"
-        },
-        {
-            "name": "Case 5: firm_ia_scope not found anywhere",
-            "data": {
+            expected_result=True,  # Still compliant because registration_status is APPROVED
+            expected_location="main business_info"
+        ),
+        Case(
+            name="Case 5: firm_ia_scope not found anywhere",
+            data={
                 "is_sec_registered": True,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -88,12 +91,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": True,  # Still compliant because registration_status is APPROVED
-            "expected_location": "not found"
-        },
-        {
-            "name": "Case 6: registration_status is not APPROVED but firm_ia_scope is ACTIVE",
-            "data": {
+            expected_result=True,  # Still compliant because registration_status is APPROVED
+            expected_location="not found"
+        ),
+        Case(
+            name="Case 6: registration_status is not APPROVED but firm_ia_scope is ACTIVE",
+            data={
                 "is_sec_registered": False,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -104,12 +107,12 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": False,  # Not compliant because registration_status is PENDING
-            "expected_location": "sec_search_result"
-        },
-        {
-            "name": "Case 7: registration_status is TERMINATED",
-            "data": {
+            expected_result=False,  # Not compliant because registration_status is PENDING
+            expected_location="sec_search_result"
+        ),
+        Case(
+            name="Case 7: registration_status is TERMINATED",
+            data={
                 "is_sec_registered": False,
                 "is_finra_registered": False,
                 "is_state_registered": False,
@@ -118,54 +121,57 @@ def test_with_mock_data():
                 "last_updated": "2025-01-01T00:00:00Z",
                 "data_sources": ["SEC", "FINRA"]
             },
-            "expected_result": False,  # Not compliant because registration_status is TERMINATED
-            "expected_location": "main business_info"
-        }
+            expected_result=False,  # Not compliant because registration_status is TERMINATED
+            expected_location="main business_info"
+        )
     ]
     
+    # One summary row per case, written in a single call after the loop
+    summary = []
+    
     # Run each test case
-    for i, case in enumerate(test_cases):
-        logger.info(f"Running {case['name']}")
+    for name, data, expected_result, expected_location in test_cases:
+        logger.info("Running %s", name)
         
         # Call the function
-        is_compliant, explanation, alerts = evaluate_registration_status(case['data'])
+        is_compliant, explanation, alerts = evaluate_registration_status(data)
         
         # Check if the result matches the expected result
-        result_matches = is_compliant == case['expected_result']
+        result_matches = is_compliant == expected_result
         
-        # Log the results
-        logger.info(f"Expected result: {case['expected_result']}")
-        logger.info(f"Actual result: {is_compliant}")
-        logger.info(f"Explanation: {explanation}")
+        # Log the explanation; expected and actual results go in the summary
+        logger.info("Explanation: %s", explanation)
         
         # Check where firm_ia_scope was found
-        if case['expected_location'] == "main business_info":
-            found = "firm_ia_scope" in case['data']
-            logger.info(f"firm_ia_scope found in main business_info: {found}")
-        elif case['expected_location'] == "sec_search_result":
-            found = "sec_search_result" in case['data'] and "firm_ia_scope" in case['data']['sec_search_result']
-            logger.info(f"firm_ia_scope found in sec_search_result: {found}")
-        elif case['expected_location'] == "finra_search_result":
-            found = "finra_search_result" in case['data'] and "firm_ia_scope" in case['data']['finra_search_result']
-            logger.info(f"firm_ia_scope found in finra_search_result: {found}")
+        if expected_location == "main business_info":
+            found = "firm_ia_scope" in data
+            logger.info("firm_ia_scope found in main business_info: %s", found)
+        elif expected_location == "sec_search_result":
+            found = "sec_search_result" in data and "firm_ia_scope" in data['sec_search_result']
+            logger.info("firm_ia_scope found in sec_search_result: %s", found)
+        elif expected_location == "finra_search_result":
+            found = "finra_search_result" in data and "firm_ia_scope" in data['finra_search_result']
+            logger.info("firm_ia_scope found in finra_search_result: %s", found)
         else:
             logger.info("firm_ia_scope not expected to be found")
         
         # Log any alerts
         if alerts:
-            logger.info(f"Alerts ({len(alerts)}):")
+            logger.info("Alerts (%s):", len(alerts))
             for alert in alerts:
-                logger.info(f"  - [{alert.severity.value}] {alert.alert_type}: {alert.description}")
+                logger.info("  - [%s] %s: %s", alert.severity.value, alert.alert_type, alert.description)
         else:
             logger.info("No alerts generated")
         
-        # Log the test result
-        if result_matches:
-            logger.info("TEST PASSED ✓")
-        else:
-            logger.error("TEST FAILED ✗")
+        # Record the test result
+        summary.append(
+            f"{name} | exp={expected_result} | act={is_compliant} | "
+            f"{'PASS ✓' if result_matches else 'FAIL ✗'}"
+        )
         
         logger.info("-" * 50)
+    
+    sys.stdout.write("\n".join(summary) + "\n")
 
 if __name__ == "__main__":
     test_with_mock_data()
\ No newline at end of file
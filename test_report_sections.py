@@ -5,13 +5,42 @@ are properly removed from the final compliance report.
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
 from evaluation.firm_evaluation_report_builder import FirmEvaluationReportBuilder
+from utils.report_io import dumps_report
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Sections that must not appear in the final report
+EXCLUDED_SECTIONS = ("arbitration_review", "adv_evaluation", "disciplinary_evaluation")
+_EXCLUDED = frozenset(EXCLUDED_SECTIONS)
+
+# Schema rejecting any report that still contains an excluded section
+EXCLUDED_SECTIONS_SCHEMA = {
+    "type": "object",
+    "not": {"anyOf": [{"required": [section]} for section in EXCLUDED_SECTIONS]}
+}
+
+# Compiled once at import when fastjsonschema is installed
+_validate_report = fastjsonschema.compile(EXCLUDED_SECTIONS_SCHEMA) if fastjsonschema else None
+
+def find_unexcluded_sections(report):
+    """Return the excluded sections that are still present in the report."""
+    if _validate_report is not None:
+        try:
+            _validate_report(report)
+            return []
+        except fastjsonschema.JsonSchemaException:
+            pass
+    # dict keys support set operations, so the membership checks run in C
+    return sorted(_EXCLUDED & report.keys())
 
 def main():
     """Test the removal of specified sections from the compliance report."""
@@ -83,8 +112,7 @@ def main():
     report = builder.build()
     
     # Check if the excluded sections are not in the final report
-    sections_to_exclude = ["arbitration_review", "adv_evaluation", "disciplinary_evaluation"]
-    excluded_sections = [section for section in sections_to_exclude if section in report]
+    excluded_sections = find_unexcluded_sections(report)
     
     if excluded_sections:
         print(f"ERROR: The following sections were not properly excluded: {', '.join(excluded_sections)}")
@@ -97,8 +125,8 @@ def main():
         print(f"- {section}")
     
     # Save the report to a file for inspection
-    with open("test_report_output.json", "w") as f:
-        json.dump(report, f, indent=2)
+    with open("test_report_output.json", "wb") as f:
+        f.write(dumps_report(report))
     
     print("\nFull report saved to test_report_output.json for inspection")
 
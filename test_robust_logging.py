@@ -16,7 +16,6 @@ import sys
 import time
 import logging
 import tempfile
-import shutil
 from pathlib import Path
 
 # Add the current directory to the path so we can import our modules
@@ -29,112 +28,199 @@ from utils.robust_logging_config import (
     create_celery_logger
 )
 
+# Shared by every handler the tests create
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+def _handle_batch(handler, records):
+    """
+    Write several records through an ErrorHandlingRotatingFileHandler under one
+    lock acquisition, flushing once.
+    
+    Records are filtered as in Handler.handle(). A record that fails to write,
+    and every record of a batch whose final flush fails, goes through
+    handleError(), which counts the error and routes it to the fallback handler.
+    """
+    records = [r for r in records if r.levelno >= handler.level and handler.filter(r)]
+    if not records:
+        return
+    
+    with handler.lock:
+        written = []
+        for record in records:
+            if handler.disabled_due_to_errors:
+                handler.emit(record)
+                continue
+            try:
+                if handler.shouldRollover(record):
+                    handler.doRollover()
+                if handler.stream is None:
+                    handler.stream = handler._open()
+                handler.stream.write(handler.format(record) + handler.terminator)
+                written.append(record)
+            except Exception:
+                handler.handleError(record)
+        
+        if written:
+            try:
+                handler.flush()
+            except Exception:
+                # None of the written records is known to have reached the file
+                for record in written:
+                    handler.handleError(record)
+
+def _burst(logger, messages):
+    """
+    Log several (level, message) pairs as one batch.
+    
+    Records are created and filtered as Logger.log() would, then passed up the
+    logger's propagation chain. ErrorHandlingRotatingFileHandler instances get
+    the whole batch through _handle_batch(); other handlers get each record.
+    """
+    records = [
+        logger.makeRecord(logger.name, level, __file__, 0, msg, None, None)
+        for level, msg in messages
+        if logger.isEnabledFor(level)
+    ]
+    records = [record for record in records if logger.filter(record)]
+    if not records:
+        return
+    
+    found = False
+    current = logger
+    while current:
+        for handler in current.handlers:
+            found = True
+            if isinstance(handler, ErrorHandlingRotatingFileHandler):
+                _handle_batch(handler, records)
+            else:
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+        if not current.propagate:
+            break
+        current = current.parent
+    
+    if not found and logging.lastResort:
+        for record in records:
+            if record.levelno >= logging.lastResort.level:
+                logging.lastResort.handle(record)
+
+def _close_handlers(logger):
+    """Close and detach all of a logger's handlers so their files are released."""
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+
 def test_error_handling_handler():
     """Test that the ErrorHandlingRotatingFileHandler handles I/O errors gracefully."""
     print("\n=== Testing ErrorHandlingRotatingFileHandler ===")
     
-    # Create a temporary directory for testing
-    temp_dir = tempfile.mkdtemp()
-    log_file = os.path.join(temp_dir, "test.log")
+    # Create a logger with our error handling handler
+    logger = logging.getLogger("test_handler")
     
-    try:
-        # Create a logger with our error handling handler
-        logger = logging.getLogger("test_handler")
-        logger.setLevel(logging.INFO)
-        logger.handlers.clear()
-        
-        # Create console handler as fallback
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(formatter)
-        
-        # Create file handler with error handling
-        file_handler = ErrorHandlingRotatingFileHandler(
-            log_file,
-            maxBytes=1024,  # Small size for testing
-            backupCount=3,
-            max_errors=3
-        )
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
-        file_handler.set_fallback_handler(console_handler)
-        
-        # Add handlers to logger
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
-        
-        # Test normal logging
-        print("Testing normal logging...")
-        logger.info("This is a test log message")
-        logger.warning("This is a warning message")
-        logger.error("This is an error message")
-        
-        # Verify log file was created
-        if os.path.exists(log_file):
-            print(f"✅ Log file created successfully: {log_file}")
-            with open(log_file, 'r') as f:
-                content = f.read()
-                print(f"Log file content:\n{content}")
-        else:
-            print(f"❌ Log file was not created: {log_file}")
-        
-        # Simulate I/O error by making the log file read-only
-        print("\nSimulating I/O error by making log file read-only...")
-        os.chmod(log_file, 0o444)  # Read-only
-        
-        # Try to log after making file read-only
-        logger.info("This message should go to the fallback handler")
-        logger.warning("This warning should go to the fallback handler")
-        logger.error("This error should go to the fallback handler")
-        
-        # Verify handler switched to fallback after errors
-        print(f"Error count: {file_handler.error_count}")
-        print(f"Handler disabled: {file_handler.disabled_due_to_errors}")
-        
-        if file_handler.error_count > 0:
-            print("✅ Error handling worked - errors were caught")
-        else:
-            print("❌ No errors were caught - something is wrong")
+    # The temporary directory is removed when the block exits
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file = os.path.join(temp_dir, "test.log")
+        
+        try:
+            logger.setLevel(logging.INFO)
+            logger.handlers.clear()
+        
+            # Create console handler as fallback
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(_FORMATTER)
+        
+            # Create file handler with error handling
+            file_handler = ErrorHandlingRotatingFileHandler(
+                log_file,
+                maxBytes=1024,  # Small size for testing
+                backupCount=3,
+                max_errors=3
+            )
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(_FORMATTER)
+            file_handler.set_fallback_handler(console_handler)
+        
+            # Add handlers to logger
+            logger.addHandler(console_handler)
+            logger.addHandler(file_handler)
+        
+            # Test normal logging
+            print("Testing normal logging...")
+            _burst(logger, [
+                (logging.INFO, "This is a test log message"),
+                (logging.WARNING, "This is a warning message"),
+                (logging.ERROR, "This is an error message")
+            ])
+        
+            # Verify log file was created
+            if os.path.exists(log_file):
+                print(f"✅ Log file created successfully: {log_file}")
+                with open(log_file, 'r') as f:
+                    content = f.read()
+                    print(f"Log file content:\n{content}")
+            else:
+                print(f"❌ Log file was not created: {log_file}")
+        
+            # Simulate I/O error by making the log file read-only
+            print("\nSimulating I/O error by making log file read-only...")
+            os.chmod(log_file, 0o444)  # Read-only
+        
+            # Try to log after making file read-only
+            _burst(logger, [
+                (logging.INFO, "This message should go to the fallback handler"),
+                (logging.WARNING, "This warning should go to the fallback handler"),
+                (logging.ERROR, "This error should go to the fallback handler")
+            ])
+        
+            # Verify handler switched to fallback after errors
+            print(f"Error count: {file_handler.error_count}")
+            print(f"Handler disabled: {file_handler.disabled_due_to_errors}")
+        
+            if file_handler.error_count > 0:
+                print("✅ Error handling worked - errors were caught")
+            else:
+                print("❌ No errors were caught - something is wrong")
             
-        if file_handler.disabled_due_to_errors:
-            print("✅ Handler was disabled after max errors")
-        
-        # Make the file writable again
-        print("\nMaking log file writable again...")
-        os.chmod(log_file, 0o644)  # Read-write
-        
-        # Create a new handler to test recovery
-        logger.handlers.clear()
-        new_file_handler = ErrorHandlingRotatingFileHandler(
-            log_file,
-            maxBytes=1024,
-            backupCount=3,
-            max_errors=3
-        )
-        new_file_handler.setLevel(logging.INFO)
-        new_file_handler.setFormatter(formatter)
-        new_file_handler.set_fallback_handler(console_handler)
-        
-        logger.addHandler(console_handler)
-        logger.addHandler(new_file_handler)
-        
-        # Test logging after recovery
-        print("Testing logging after recovery...")
-        logger.info("This message should go to the log file again")
-        
-        # Verify log file was updated
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                content = f.read()
-                if "after recovery" in content:
-                    print("✅ Logging recovered successfully")
-                else:
-                    print("❌ Logging did not recover")
-        
-    finally:
-        # Clean up
-        shutil.rmtree(temp_dir)
+            if file_handler.disabled_due_to_errors:
+                print("✅ Handler was disabled after max errors")
+        
+            # Make the file writable again
+            print("\nMaking log file writable again...")
+            os.chmod(log_file, 0o644)  # Read-write
+        
+            # Create a new handler to test recovery
+            logger.handlers.clear()
+            new_file_handler = ErrorHandlingRotatingFileHandler(
+                log_file,
+                maxBytes=1024,
+                backupCount=3,
+                max_errors=3
+            )
+            new_file_handler.setLevel(logging.INFO)
+            new_file_handler.setFormatter(_FORMATTER)
+            new_file_handler.set_fallback_handler(console_handler)
+        
+            logger.addHandler(console_handler)
+            logger.addHandler(new_file_handler)
+        
+            # Test logging after recovery
+            print("Testing logging after recovery...")
+            logger.info("This message should go to the log file again")
+        
+            # Verify log file was updated
+            if os.path.exists(log_file):
+                with open(log_file, 'r') as f:
+                    content = f.read()
+                    if "after recovery" in content:
+                        print("✅ Logging recovered successfully")
+                    else:
+                        print("❌ Logging did not recover")
+        
+        finally:
+            # Release the log file before the directory is removed
+            _close_handlers(logger)
 
 def test_setup_robust_logging():
     """Test the setup_robust_logging function."""
@@ -157,42 +243,45 @@ def test_create_celery_logger():
     """Test the create_celery_logger function."""
     print("\n=== Testing create_celery_logger ===")
     
-    # Create a temporary directory for testing
-    temp_dir = tempfile.mkdtemp()
-    
-    try:
+    # The temporary directory is removed when the block exits
+    with tempfile.TemporaryDirectory() as temp_dir:
         # Create a Celery logger
         logger = create_celery_logger("test_celery", log_dir=temp_dir)
         
-        # Test logging
-        logger.info("Test info message from Celery logger")
-        logger.warning("Test warning message from Celery logger")
-        logger.error("Test error message from Celery logger")
-        
-        # Verify log file was created
-        log_file = os.path.join(temp_dir, "test_celery.log")
-        if os.path.exists(log_file):
-            print(f"✅ Celery log file created successfully: {log_file}")
-            with open(log_file, 'r') as f:
-                content = f.read()
-                print(f"Log file content:\n{content}")
-        else:
-            print(f"❌ Celery log file was not created: {log_file}")
-        
-        # Simulate I/O error
-        print("\nSimulating I/O error by making log file read-only...")
-        os.chmod(log_file, 0o444)  # Read-only
-        
-        # Try to log after making file read-only
-        logger.info("This message should go to the fallback handler")
-        logger.warning("This warning should go to the fallback handler")
-        logger.error("This error should go to the fallback handler")
-        
-        print("✅ create_celery_logger test complete")
-        
-    finally:
-        # Clean up
-        shutil.rmtree(temp_dir)
+        try:
+            # Test logging
+            _burst(logger, [
+                (logging.INFO, "Test info message from Celery logger"),
+                (logging.WARNING, "Test warning message from Celery logger"),
+                (logging.ERROR, "Test error message from Celery logger")
+            ])
+        
+            # Verify log file was created
+            log_file = os.path.join(temp_dir, "test_celery.log")
+            if os.path.exists(log_file):
+                print(f"✅ Celery log file created successfully: {log_file}")
+                with open(log_file, 'r') as f:
+                    content = f.read()
+                    print(f"Log file content:\n{content}")
+            else:
+                print(f"❌ Celery log file was not created: {log_file}")
+        
+            # Simulate I/O error
+            print("\nSimulating I/O error by making log file read-only...")
+            os.chmod(log_file, 0o444)  # Read-only
+        
+            # Try to log after making file read-only
+            _burst(logger, [
+                (logging.INFO, "This message should go to the fallback handler"),
+                (logging.WARNING, "This warning should go to the fallback handler"),
+                (logging.ERROR, "This error should go to the fallback handler")
+            ])
+        
+            print("✅ create_celery_logger test complete")
+        
+        finally:
+            # Release the log file before the directory is removed
+            _close_handlers(logger)
 
 def main():
     """Run all tests."""
@@ -4,34 +4,49 @@ Test script to verify SEC number display for entities with Status alerts.
 """
 
 import sys
-import json
 from pathlib import Path
 import logging
-from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from services.firm_services import FirmServicesFacade
+from services.caching_facade import CachingFirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
+from utils.report_io import RUN_STARTED_AT, stream_report
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+Entity = namedtuple("Entity", "crd name")
+
+# Entities to test
+_ENTITIES = (
+    Entity("10863", "GATE US LLC"),
+    Entity("8605", "WALLACH FX OPTIONS INC."),
+    Entity("110397", "ZWJ INVESTMENT COUNSEL INC"),
+    Entity("16688", "ADAMS SECURITIES, INC.")
+)
+
+@lru_cache(maxsize=1)
+def _get_facade():
+    """Create the facade on first use and share it across entities."""
+    return CachingFirmServicesFacade()
+
 def test_entity(crd_number, entity_name):
     """Generate a compliance report for a firm with the given CRD number and verify SEC number display."""
-    # Create facade
-    facade = FirmServicesFacade()
-    
-    # Search parameters
-    subject_id = f"test_subject_{crd_number}"
+    # Use the shared facade; process_claim searches through it as well, so the
+    # lookup below is reused instead of repeated
+    facade = _get_facade()
     
     # Search for firm by CRD
-    logger.info(f"Searching for firm with CRD: {crd_number} ({entity_name})")
-    firm_details = facade.search_firm_by_crd(subject_id, crd_number)
+    logger.info("Searching for firm with CRD: %s (%s)", crd_number, entity_name)
+    firm_details = facade.search_firm_by_crd(f"test_subject_{crd_number}", crd_number)
     
     if firm_details:
         # Create a claim for processing
@@ -43,7 +58,7 @@ def test_entity(crd_number, entity_name):
         }
         
         # Process the claim to generate a compliance report
-        logger.info(f"Generating compliance report for {entity_name} (CRD: {crd_number})")
+        logger.info("Generating compliance report for %s (CRD: %s)", entity_name, crd_number)
         report = process_claim(
             claim=claim,
             facade=facade,
@@ -56,31 +71,31 @@ def test_entity(crd_number, entity_name):
             # Add the claim to the report
             report["claim"] = claim
             
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
+            # Add timestamp; the run's start time is already an ISO string, so the
+            # report holds only JSON-native values
+            report["generated_at"] = RUN_STARTED_AT
             
-            # Save the report to a file
+            # Save the report to a file; sections are encoded one at a time into a
+            # large write buffer, so embedded raw data never needs one huge string
             output_file = f"compliance_report_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            stream_report(report, output_file)
             
-            logger.info(f"Compliance report saved to {output_file}")
+            logger.info("Compliance report saved to %s", output_file)
             
             # Check if SEC number is present in the entity section
             entity_section = report.get("entity", {})
             sec_number = entity_section.get("sec_number", "")
             
-            # Check if there's a NoActiveRegistration alert
+            # Check if there's a NoActiveRegistration alert; collecting the alert
+            # types once makes each further check a set lookup
             status_evaluation = report.get("status_evaluation", {})
-            alerts = status_evaluation.get("alerts", [])
-            has_no_active_registration_alert = any(
-                alert.get("alert_type") == "NoActiveRegistration" for alert in alerts
-            )
+            alert_types = {alert.get("alert_type") for alert in status_evaluation.get("alerts", [])}
+            has_no_active_registration_alert = "NoActiveRegistration" in alert_types
             
-            logger.info(f"Entity: {entity_name}")
-            logger.info(f"CRD: {crd_number}")
-            logger.info(f"SEC Number: {sec_number}")
-            logger.info(f"Has NoActiveRegistration Alert: {has_no_active_registration_alert}")
+            logger.info("Entity: %s", entity_name)
+            logger.info("CRD: %s", crd_number)
+            logger.info("SEC Number: %s", sec_number)
+            logger.info("Has NoActiveRegistration Alert: %s", has_no_active_registration_alert)
             
             return {
                 "entity_name": entity_name,
@@ -91,25 +106,22 @@ def test_entity(crd_number, entity_name):
         else:
             logger.error("Failed to generate compliance report")
     else:
-        logger.error(f"No firm found with CRD: {crd_number}")
+        logger.error("No firm found with CRD: %s", crd_number)
     
     return None
 
 def main():
     """Test SEC number display for specific entities."""
-    # List of entities to test
-    entities = [
-        {"crd": "10863", "name": "GATE US LLC"},
-        {"crd": "8605", "name": "WALLACH FX OPTIONS INC."},
-        {"crd": "110397", "name": "ZWJ INVESTMENT COUNSEL INC"},
-        {"crd": "16688", "name": "ADAMS SECURITIES, INC."}
-    ]
+    # Create the facade before the pool starts, so every worker shares one
+    # instance and takes turns on its (locked) service-level delay; lru_cache
+    # could otherwise build one facade per racing worker
+    _get_facade()
     
-    results = []
-    for entity in entities:
-        result = test_entity(entity["crd"], entity["name"])
-        if result:
-            results.append(result)
+    # Each lookup blocks on SEC/FINRA requests, so run them concurrently;
+    # map() keeps the results in entity order
+    with ThreadPoolExecutor(max_workers=len(_ENTITIES)) as executor:
+        outcomes = executor.map(lambda entity: test_entity(entity.crd, entity.name), _ENTITIES)
+        results = [result for result in outcomes if result]
     
     # Print summary
     print("\nTest Results Summary:")
@@ -22,31 +22,33 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# basic_result shared by the synthetic "Test Firm" cases; each test overrides sec_number
+TEST_FIRM_BASIC_RESULT = {
+    "firm_name": "Test Firm",
+    "crd_number": "123456",
+    "registration_status": "APPROVED"
+}
+
 class TestSECNumberExtraction(unittest.TestCase):
     """Test cases for SEC number extraction from search results."""
 
+    def build_report(self, reference_id, search_evaluation):
+        """Build a report from a search evaluation with a fresh builder."""
+        builder = FirmEvaluationReportBuilder(reference_id)
+        builder.set_search_evaluation(search_evaluation)
+        return builder.build()
+
     def test_sec_number_from_basic_result(self):
         """Test that SEC number is correctly extracted from basic_result."""
-        # Create a builder
-        builder = FirmEvaluationReportBuilder("test-ref-001")
-        
         # Create a search evaluation with SEC number in basic_result
         search_evaluation = {
             "source": "SEC",
             "compliance": True,
-            "basic_result": {
-                "firm_name": "Test Firm",
-                "crd_number": "123456",
-                "sec_number": "801-123456",
-                "registration_status": "APPROVED"
-            }
+            "basic_result": {**TEST_FIRM_BASIC_RESULT, "sec_number": "801-123456"}
         }
         
-        # Set the search evaluation
-        builder.set_search_evaluation(search_evaluation)
-        
         # Build the report
-        report = builder.build()
+        report = self.build_report("test-ref-001", search_evaluation)
         
         # Verify that the SEC number is correctly extracted
         self.assertEqual(report["entity"]["sec_number"], "801-123456")
@@ -54,19 +56,11 @@ class TestSECNumberExtraction(unittest.TestCase):
 
     def test_sec_number_from_full_sec_number(self):
         """Test that SEC number is correctly extracted from firm_ia_full_sec_number when missing from basic_result."""
-        # Create a builder
-        builder = FirmEvaluationReportBuilder("test-ref-002")
-        
         # Create a search evaluation with SEC number missing from basic_result but present in sec_search_result
         search_evaluation = {
             "source": "SEC",
             "compliance": True,
-            "basic_result": {
-                "firm_name": "Test Firm",
-                "crd_number": "123456",
-                "sec_number": "",  # SEC number is missing
-                "registration_status": "APPROVED"
-            },
+            "basic_result": {**TEST_FIRM_BASIC_RESULT, "sec_number": ""},  # SEC number is missing
             "sec_search_result": {
                 "org_name": "Test Firm",
                 "org_crd": "123456",
@@ -75,11 +69,8 @@ class TestSECNumberExtraction(unittest.TestCase):
             }
         }
         
-        # Set the search evaluation
-        builder.set_search_evaluation(search_evaluation)
-        
         # Build the report
-        report = builder.build()
+        report = self.build_report("test-ref-002", search_evaluation)
         
         # Verify that the SEC number is correctly extracted from sec_search_result
         self.assertEqual(report["entity"]["sec_number"], "802-654321")
@@ -87,20 +78,12 @@ class TestSECNumberExtraction(unittest.TestCase):
 
     def test_sec_number_constructed_from_sec_number(self):
         """Test that SEC number is correctly constructed from firm_ia_sec_number when full_sec_number is missing."""
-        # Create a builder
-        builder = FirmEvaluationReportBuilder("test-ref-003")
-        
         # Create a search evaluation with SEC number missing from basic_result and full_sec_number
         # but present as firm_ia_sec_number
         search_evaluation = {
             "source": "SEC",
             "compliance": True,
-            "basic_result": {
-                "firm_name": "Test Firm",
-                "crd_number": "123456",
-                "sec_number": "",  # SEC number is missing
-                "registration_status": "APPROVED"
-            },
+            "basic_result": {**TEST_FIRM_BASIC_RESULT, "sec_number": ""},  # SEC number is missing
             "sec_search_result": {
                 "org_name": "Test Firm",
                 "org_crd": "123456",
@@ -110,11 +93,8 @@ class TestSECNumberExtraction(unittest.TestCase):
             }
         }
         
-        # Set the search evaluation
-        builder.set_search_evaluation(search_evaluation)
-        
         # Build the report
-        report = builder.build()
+        report = self.build_report("test-ref-003", search_evaluation)
         
         # Verify that the SEC number is correctly constructed
         self.assertEqual(report["entity"]["sec_number"], "801-987654")
@@ -122,9 +102,6 @@ class TestSECNumberExtraction(unittest.TestCase):
 
     def test_real_world_example(self):
         """Test with a real-world example from the issue report."""
-        # Create a builder
-        builder = FirmEvaluationReportBuilder("test-ref-004")
-        
         # Create a search evaluation based on the real-world example
         search_evaluation = {
             "source": "SEC",
@@ -151,11 +128,8 @@ class TestSECNumberExtraction(unittest.TestCase):
             }
         }
         
-        # Set the search evaluation
-        builder.set_search_evaluation(search_evaluation)
-        
         # Build the report
-        report = builder.build()
+        report = self.build_report("test-ref-004", search_evaluation)
         
         # Verify that the SEC number is correctly extracted
         self.assertEqual(report["entity"]["sec_number"], "802-115072")
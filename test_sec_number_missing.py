@@ -4,43 +4,65 @@ Test script to investigate missing SEC numbers for specific firms.
 This script checks the SEC number display for firms that are reported to have missing SEC numbers.
 """
 
+import os
 import sys
-import json
 from pathlib import Path
 import logging
-from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add parent directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
-from services.firm_services import FirmServicesFacade
+from services.caching_facade import CachingFirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_processor import evaluate_registration_status
+from utils.report_io import RUN_STARTED_AT, stream_report
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Sections written to the saved report; set YOLO_FULL_REPORT=1 to keep the rest,
+# such as basic_result with its raw SEC data
+SAVED_SECTIONS = ("entity", "status_evaluation", "claim", "generated_at", "final_evaluation")
+FULL_REPORT = os.getenv("YOLO_FULL_REPORT", "").lower() in ("true", "1", "yes")
+
+Entity = namedtuple("Entity", "crd name")
+
+# Entities to test
+_ENTITIES = (
+    Entity("288357", "QVR ADVISORS"),
+    Entity("106108", "BNY ADVISORS"),
+    Entity("29116", "Brookstone Securities, Inc."),
+    Entity("110181", "BROWN ADVISORY"),
+    Entity("284175", "GORDON DYAL & CO., LLC")
+)
+
+@lru_cache(maxsize=1)
+def _get_facade():
+    """Create the facade on first use and share it across entities."""
+    return CachingFirmServicesFacade()
+
 def test_entity(crd_number, entity_name):
     """Generate a compliance report for a firm with the given CRD number and verify SEC number display."""
-    # Create facade
-    facade = FirmServicesFacade()
-    
-    # Search parameters
-    subject_id = f"test_subject_{crd_number}"
+    # Use the shared facade; process_claim searches through it as well, so the
+    # lookup below is reused instead of repeated
+    facade = _get_facade()
     
     # Search for firm by CRD
-    logger.info(f"Searching for firm with CRD: {crd_number} ({entity_name})")
-    firm_details = facade.search_firm_by_crd(subject_id, crd_number)
+    logger.info("Searching for firm with CRD: %s (%s)", crd_number, entity_name)
+    firm_details = facade.search_firm_by_crd(f"test_subject_{crd_number}", crd_number)
     
     if firm_details:
-        # Log the raw SEC search result if available
-        if 'sec_search_result' in firm_details:
+        # Log the raw SEC search result if available and INFO is enabled
+        if 'sec_search_result' in firm_details and logger.isEnabledFor(logging.INFO):
             sec_result = firm_details.get('sec_search_result', {})
             logger.info("SEC search result:")
-            logger.info(f"  - firm_ia_sec_number: {sec_result.get('firm_ia_sec_number', 'Not found')}")
-            logger.info(f"  - firm_ia_full_sec_number: {sec_result.get('firm_ia_full_sec_number', 'Not found')}")
+            logger.info("  - firm_ia_sec_number: %s", sec_result.get('firm_ia_sec_number', 'Not found'))
+            logger.info("  - firm_ia_full_sec_number: %s", sec_result.get('firm_ia_full_sec_number', 'Not found'))
         
         # Create a claim for processing
         claim = {
@@ -51,7 +73,7 @@ def test_entity(crd_number, entity_name):
         }
         
         # Process the claim to generate a compliance report
-        logger.info(f"Generating compliance report for {entity_name} (CRD: {crd_number})")
+        logger.info("Generating compliance report for %s (CRD: %s)", entity_name, crd_number)
         report = process_claim(
             claim=claim,
             facade=facade,
@@ -64,26 +86,29 @@ def test_entity(crd_number, entity_name):
             # Add the claim to the report
             report["claim"] = claim
             
-            # Add timestamp
-            report["generated_at"] = datetime.now().isoformat()
+            # Add timestamp; the run's start time is already an ISO string, so the
+            # report holds only JSON-native values
+            report["generated_at"] = RUN_STARTED_AT
             
-            # Save the report to a file
+            # Save the report to a file; sections are encoded one at a time into a
+            # large write buffer, so embedded raw data never needs one huge string
             output_file = f"compliance_report_{crd_number}.json"
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            saved = report if FULL_REPORT else {
+                key: report[key] for key in SAVED_SECTIONS if key in report
+            }
+            stream_report(saved, output_file)
             
-            logger.info(f"Compliance report saved to {output_file}")
+            logger.info("Compliance report saved to %s", output_file)
             
             # Check if SEC number is present in the entity section
             entity_section = report.get("entity", {})
             sec_number = entity_section.get("sec_number", "")
             
-            # Check if there's a NoActiveRegistration alert
+            # Check if there's a NoActiveRegistration alert; collecting the alert
+            # types once makes each further check a set lookup
             status_evaluation = report.get("status_evaluation", {})
-            alerts = status_evaluation.get("alerts", [])
-            has_no_active_registration_alert = any(
-                alert.get("alert_type") == "NoActiveRegistration" for alert in alerts
-            )
+            alert_types = {alert.get("alert_type") for alert in status_evaluation.get("alerts", [])}
+            has_no_active_registration_alert = "NoActiveRegistration" in alert_types
             
             # Check if firm is inactive/expelled
             firm_status = entity_section.get("firm_status", "")
@@ -92,16 +117,16 @@ def test_entity(crd_number, entity_name):
             # Check registration status
             registration_status = entity_section.get("registration_status", "")
             
-            logger.info(f"Entity: {entity_name}")
-            logger.info(f"CRD: {crd_number}")
-            logger.info(f"SEC Number: {sec_number}")
-            logger.info(f"Firm Status: {firm_status}")
-            logger.info(f"Registration Status: {registration_status}")
-            logger.info(f"Has NoActiveRegistration Alert: {has_no_active_registration_alert}")
+            logger.info("Entity: %s", entity_name)
+            logger.info("CRD: %s", crd_number)
+            logger.info("SEC Number: %s", sec_number)
+            logger.info("Firm Status: %s", firm_status)
+            logger.info("Registration Status: %s", registration_status)
+            logger.info("Has NoActiveRegistration Alert: %s", has_no_active_registration_alert)
             
             # Check if SEC number is missing but should be present
             if not sec_number or sec_number == "-":
-                logger.warning(f"MISSING SEC NUMBER: {entity_name} (CRD: {crd_number})")
+                logger.warning("MISSING SEC NUMBER: %s (CRD: %s)", entity_name, crd_number)
                 
                 # Check if we can find the SEC number in the raw data
                 if 'basic_result' in report and 'raw_data' in report['basic_result']:
@@ -113,9 +138,9 @@ def test_entity(crd_number, entity_name):
                         bd_sec_number = basic_info.get('bdSECNumber')
                         
                         logger.info("Raw SEC number data:")
-                        logger.info(f"  - iaSECNumber: {ia_sec_number}")
-                        logger.info(f"  - iaSECNumberType: {ia_sec_number_type}")
-                        logger.info(f"  - bdSECNumber: {bd_sec_number}")
+                        logger.info("  - iaSECNumber: %s", ia_sec_number)
+                        logger.info("  - iaSECNumberType: %s", ia_sec_number_type)
+                        logger.info("  - bdSECNumber: %s", bd_sec_number)
                         
                         # Calculate what the SEC number should be
                         expected_sec_number = ""
@@ -125,7 +150,7 @@ def test_entity(crd_number, entity_name):
                             expected_sec_number = f"8-{bd_sec_number}"
                             
                         if expected_sec_number:
-                            logger.info(f"Expected SEC Number: {expected_sec_number}")
+                            logger.info("Expected SEC Number: %s", expected_sec_number)
             
             return {
                 "entity_name": entity_name,
@@ -139,26 +164,22 @@ def test_entity(crd_number, entity_name):
         else:
             logger.error("Failed to generate compliance report")
     else:
-        logger.error(f"No firm found with CRD: {crd_number}")
+        logger.error("No firm found with CRD: %s", crd_number)
     
     return None
 
 def main():
     """Test SEC number display for specific entities with reported missing SEC numbers."""
-    # List of entities to test
-    entities = [
-        {"crd": "288357", "name": "QVR ADVISORS"},
-        {"crd": "106108", "name": "BNY ADVISORS"},
-        {"crd": "29116", "name": "Brookstone Securities, Inc."},
-        {"crd": "110181", "name": "BROWN ADVISORY"},
-        {"crd": "284175", "name": "GORDON DYAL & CO., LLC"}
-    ]
+    # Create the facade before the pool starts, so every worker shares one
+    # instance and takes turns on its (locked) service-level delay; lru_cache
+    # could otherwise build one facade per racing worker
+    _get_facade()
     
-    results = []
-    for entity in entities:
-        result = test_entity(entity["crd"], entity["name"])
-        if result:
-            results.append(result)
+    # Each lookup blocks on SEC/FINRA requests, so run them concurrently;
+    # map() keeps the results in entity order
+    with ThreadPoolExecutor(max_workers=len(_ENTITIES)) as executor:
+        outcomes = executor.map(lambda entity: test_entity(entity.crd, entity.name), _ENTITIES)
+        results = [result for result in outcomes if result]
     
     # Print summary
     print("\nTest Results Summary:")
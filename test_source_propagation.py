@@ -17,7 +17,23 @@ sys.path.append(str(Path(__file__).parent))
 from evaluation.firm_evaluation_report_builder import FirmEvaluationReportBuilder
 from evaluation.firm_evaluation_report_director import FirmEvaluationReportDirector
 
-def test_source_propagation():
+# Fixed parts of the test input; test_source_propagation fills in the source
+_CLAIM_TEMPLATE = {
+    "business_ref": "TEST-BIZ-REF",
+    "business_name": "Test Business",
+    "organization_crd": "123456"
+}
+_SEARCH_EVALUATION_TEMPLATE = {
+    "compliance": True,
+    "compliance_explanation": "Test compliance",
+    "basic_result": {
+        "firm_name": "Test Business",
+        "crd_number": "123456",
+        "registration_status": "ACTIVE"
+    }
+}
+
+def test_source_propagation(test_source="TEST_SOURCE"):
     """Test that the source field is correctly propagated to final_evaluation."""
     print("Testing source field propagation to final_evaluation...")
     
@@ -28,28 +44,16 @@ def test_source_propagation():
     builder = FirmEvaluationReportBuilder(reference_id)
     director = FirmEvaluationReportDirector(builder)
     
-    # Create test data with a specific source
-    test_source = "TEST_SOURCE"
-    
     # Create a claim with minimal required fields
-    claim = {
-        "business_ref": "TEST-BIZ-REF",
-        "business_name": "Test Business",
-        "reference_id": reference_id,
-        "organization_crd": "123456"
-    }
+    claim = {**_CLAIM_TEMPLATE, "reference_id": reference_id}
     
-    # Create extracted info with search_evaluation containing the test source
+    # Create extracted info with search_evaluation containing the test source;
+    # basic_result is the only nested dict, so copying it keeps the template intact
     extracted_info = {
         "search_evaluation": {
+            **_SEARCH_EVALUATION_TEMPLATE,
             "source": test_source,
-            "compliance": True,
-            "compliance_explanation": "Test compliance",
-            "basic_result": {
-                "firm_name": "Test Business",
-                "crd_number": "123456",
-                "registration_status": "ACTIVE"
-            }
+            "basic_result": dict(_SEARCH_EVALUATION_TEMPLATE["basic_result"])
         }
     }
     
@@ -9,6 +9,7 @@ This script tests the webhook functionality of the Firm Compliance API by:
 
 Usage:
     python test_webhook.py
+    python test_webhook.py --mode basic extended complete
 
 Requirements:
     - requests
@@ -19,62 +20,98 @@ import http.server
 import json
 import threading
 import time
-import socketserver
 import requests
-import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import itertools
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 # Configuration
 DEFAULT_API_URL = "http://localhost:9000"
 DEFAULT_WEBHOOK_PORT = 8000
 DEFAULT_TEST_MODE = "test"  # Options: test, basic, extended, complete
+MAX_PRINTED_PAYLOAD = 2048  # Characters of each received webhook payload to print
 
 # Global variables to store received webhooks
 received_webhooks: List[Dict[str, Any]] = []
-webhook_received_event = threading.Event()
+webhook_condition = threading.Condition()
+
+# Test IDs are unique within a run: a random prefix drawn once plus a counter
+_RUN_PREFIX = os.urandom(4).hex()
+_id_counter = itertools.count()
+
+# One keep-alive session for all API calls; the API runs locally, so proxy
+# settings from the environment are not consulted
+_session = requests.Session()
+_session.trust_env = False
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.1))
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
 
 class WebhookHandler(http.server.BaseHTTPRequestHandler):
     """HTTP request handler for receiving webhooks."""
     
+    def _send_json(self, code: int, payload: Dict[str, Any]) -> None:
+        """Send a JSON response with its Content-Length and flush it in one write."""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+    
     def do_POST(self):
         """Handle POST requests (webhooks)."""
         content_length = int(self.headers.get('Content-Length', 0))
         post_data = self.rfile.read(content_length)
         
         try:
-            webhook_data = json.loads(post_data.decode('utf-8'))
+            payload = post_data.decode('utf-8')
+            webhook_data = json.loads(payload)
             print("\n✅ Webhook received!")
             print(f"Path: {self.path}")
             print(f"Headers: {self.headers}")
-            print(f"Data: {json.dumps(webhook_data, indent=2)}")
+            # Echo the payload as received, truncated; re-encoding it indented is
+            # costly for full compliance reports
+            if len(payload) > MAX_PRINTED_PAYLOAD:
+                print(f"Data: {payload[:MAX_PRINTED_PAYLOAD]}... ({len(payload)} chars)")
+            else:
+                print(f"Data: {payload}")
             
-            # Store the webhook data
-            received_webhooks.append(webhook_data)
-            
-            # Signal that we received a webhook
-            webhook_received_event.set()
+            # Store the webhook data and signal that we received a webhook
+            with webhook_condition:
+                received_webhooks.append(webhook_data)
+                webhook_condition.notify_all()
             
             # Send a 200 OK response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "success"}).encode('utf-8'))
+            self._send_json(200, {"status": "success"})
         
         except Exception as e:
             print(f"❌ Error processing webhook: {str(e)}")
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "error", "message": str(e)}).encode('utf-8'))
+            self._send_json(500, {"status": "error", "message": str(e)})
     
     def log_message(self, format, *args):
         """Override to suppress HTTP server logs."""
         return
 
-def start_webhook_server(port: int) -> socketserver.TCPServer:
-    """Start a webhook receiver server on the specified port."""
-    server = socketserver.TCPServer(("", port), WebhookHandler)
+class WebhookServer(http.server.ThreadingHTTPServer):
+    """Threaded webhook receiver whose port can be rebound straight after a restart."""
+    
+    # HTTPServer already sets SO_REUSEADDR; SO_REUSEPORT is applied on Python 3.11+
+    # where the platform supports it
+    allow_reuse_port = True
+
+def start_webhook_server(port: int) -> WebhookServer:
+    """Start a webhook receiver server on the specified port.
+    
+    Each connection is handled on its own daemon thread, so a burst of webhooks
+    is not serialized behind a slow request.
+    """
+    server = WebhookServer(("", port), WebhookHandler)
     server_thread = threading.Thread(target=server.serve_forever)
     server_thread.daemon = True
     server_thread.start()
@@ -83,7 +120,7 @@ def start_webhook_server(port: int) -> socketserver.TCPServer:
 def test_webhook_endpoint(api_url: str, webhook_url: str) -> Dict[str, Any]:
     """Test the /test-webhook endpoint."""
     print(f"\n🔍 Testing webhook endpoint with URL: {webhook_url}")
-    response = requests.post(
+    response = _session.post(
         f"{api_url}/test-webhook",
         params={"webhook_url": webhook_url}
     )
@@ -94,8 +131,9 @@ def test_webhook_endpoint(api_url: str, webhook_url: str) -> Dict[str, Any]:
 def test_process_claim(api_url: str, webhook_url: str, mode: str) -> Dict[str, Any]:
     """Test the process-claim endpoint with the specified mode."""
     # Generate a unique reference ID
-    reference_id = f"TEST-{uuid.uuid4()}"
-    business_ref = f"EN-{uuid.uuid4().hex[:6].upper()}"
+    test_number = next(_id_counter)
+    reference_id = f"TEST-{_RUN_PREFIX}-{test_number}"
+    business_ref = f"EN-{_RUN_PREFIX[:4].upper()}{test_number:02d}"
     
     print(f"\n🔍 Testing process-claim-{mode} endpoint")
     print(f"Reference ID: {reference_id}")
@@ -112,7 +150,7 @@ def test_process_claim(api_url: str, webhook_url: str, mode: str) -> Dict[str, A
     }
     
     # Make the request
-    response = requests.post(
+    response = _session.post(
         f"{api_url}/process-claim-{mode}",
         json=payload
     )
@@ -125,7 +163,7 @@ def test_process_claim(api_url: str, webhook_url: str, mode: str) -> Dict[str, A
 def check_webhook_logs(api_url: str) -> Dict[str, Any]:
     """Check the webhook logs endpoint."""
     print("\n🔍 Checking webhook logs")
-    response = requests.get(f"{api_url}/webhook-logs")
+    response = _session.get(f"{api_url}/webhook-logs")
     print(f"Response status: {response.status_code}")
     
     if response.status_code == 200:
@@ -141,18 +179,25 @@ def check_webhook_logs(api_url: str) -> Dict[str, Any]:
     
     return response.json()
 
-def wait_for_webhook(timeout: int = 30) -> bool:
-    """Wait for a webhook to be received."""
-    print(f"\n⏳ Waiting for webhook (timeout: {timeout}s)...")
-    return webhook_received_event.wait(timeout)
+def wait_for_webhook(timeout: int = 30, count: int = 1) -> bool:
+    """Wait until at least count webhooks have been received."""
+    print(f"\n⏳ Waiting for {count} webhook(s) (timeout: {timeout}s)...")
+    with webhook_condition:
+        return webhook_condition.wait_for(lambda: len(received_webhooks) >= count, timeout)
+
+def run_mode(api_url: str, webhook_url: str, mode: str) -> Dict[str, Any]:
+    """Call the endpoint for a test mode: /test-webhook for "test", process-claim otherwise."""
+    if mode == "test":
+        return test_webhook_endpoint(api_url, webhook_url)
+    return test_process_claim(api_url, webhook_url, mode)
 
 def main():
     """Main function to run the webhook test."""
     parser = argparse.ArgumentParser(description="Test webhook functionality of the Firm Compliance API")
     parser.add_argument("--api-url", default=DEFAULT_API_URL, help=f"API URL (default: {DEFAULT_API_URL})")
     parser.add_argument("--webhook-port", type=int, default=DEFAULT_WEBHOOK_PORT, help=f"Port for webhook server (default: {DEFAULT_WEBHOOK_PORT})")
-    parser.add_argument("--mode", default=DEFAULT_TEST_MODE, choices=["test", "basic", "extended", "complete"], 
-                        help=f"Test mode (default: {DEFAULT_TEST_MODE})")
+    parser.add_argument("--mode", nargs="+", default=[DEFAULT_TEST_MODE], choices=["test", "basic", "extended", "complete"], 
+                        help=f"Test mode(s); several modes are requested concurrently (default: {DEFAULT_TEST_MODE})")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout in seconds for webhook receipt (default: 30)")
     
     args = parser.parse_args()
@@ -167,14 +212,13 @@ def main():
     server = start_webhook_server(webhook_port)
     
     try:
-        # Test the appropriate endpoint based on mode
-        if args.mode == "test":
-            test_webhook_endpoint(args.api_url, webhook_url)
-        else:
-            test_process_claim(args.api_url, webhook_url, args.mode)
+        # Test the appropriate endpoint for each mode; with several modes the
+        # requests run concurrently so the API's webhook dispatch overlaps
+        with ThreadPoolExecutor(max_workers=len(args.mode)) as executor:
+            list(executor.map(lambda mode: run_mode(args.api_url, webhook_url, mode), args.mode))
         
-        # Wait for the webhook
-        webhook_received = wait_for_webhook(args.timeout)
+        # Wait for one webhook per mode
+        webhook_received = wait_for_webhook(args.timeout, count=len(args.mode))
         
         if webhook_received:
             print("\n✅ Webhook test successful!")
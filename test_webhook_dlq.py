@@ -8,11 +8,25 @@ and checking if it's moved to the DLQ after max retries.
 
 import requests
 import json
-import time
 import redis
 import sys
 import logging
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add parent directory to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.keyspace_wait import wait_for_dead_letter
+from utils.report_io import dumps_report
+
+# Parse Redis values with orjson when it is installed
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -62,54 +76,33 @@ def test_webhook_dlq():
             # Connect to Redis
             redis_client = redis.Redis(host="localhost", port=6379, db=1, decode_responses=True)
             
-            # Wait in smaller increments and check status
             webhook_id = f"{reference_id}_{task_id}"
-            for i in range(12):  # 12 x 5 seconds = 60 seconds
-                time.sleep(5)
-                
-                # Check webhook status
-                status_key = f"webhook_status:{webhook_id}"
-                status_data_raw = redis_client.get(status_key)
-                
-                if status_data_raw:
-                    status_data = json.loads(status_data_raw)
-                    status = status_data.get("status")
-                    attempts = status_data.get("attempts", 0)
-                    logger.info(f"Webhook status: {status}, Attempts: {attempts}")
-                    
-                    if status == "failed":
-                        logger.info("Webhook has failed. Checking DLQ...")
-                        break
-                    elif attempts >= 3:
-                        logger.info(f"Webhook has reached max retries ({attempts}). Checking DLQ...")
-                        break
-                else:
-                    logger.info(f"No webhook status found for {webhook_id}")
-            
-            # Check if webhook is in DLQ
             dlq_key = f"dead_letter:webhook:{webhook_id}"
-            dlq_data_raw = redis_client.get(dlq_key)
+            dlq_index = "dead_letter:webhook:index"
             
+            # Wake when the DLQ entry is written; a failed status alone is not
+            # conclusive, since the API writes it before the DLQ entry
+            dlq_data_raw, in_dlq_index = wait_for_dead_letter(redis_client, webhook_id, timeout=60)
+            
+            # Check if webhook is in DLQ
             if dlq_data_raw:
-                dlq_data = json.loads(dlq_data_raw)
-                logger.info(f"Webhook found in DLQ: {json.dumps(dlq_data, indent=2)}")
+                dlq_data = _json_loads(dlq_data_raw)
+                logger.info(f"Webhook found in DLQ: {dumps_report(dlq_data).decode('utf-8')}")
                 logger.info("DLQ mechanism is working correctly!")
                 return True
             else:
                 logger.warning(f"Webhook not found in DLQ: {dlq_key}")
                 
                 # Check if webhook is in DLQ index
-                dlq_index = "dead_letter:webhook:index"
-                dlq_index_data = redis_client.smembers(dlq_index)
-                
-                if dlq_index_data:
-                    # Convert to list for logging
-                    dlq_index_list = list(dlq_index_data)
-                    logger.info(f"DLQ index contains: {dlq_index_list}")
-                    if webhook_id in dlq_index_list:
-                        logger.info(f"Webhook ID {webhook_id} found in DLQ index but not in DLQ")
+                if in_dlq_index:
+                    logger.info(f"Webhook ID {webhook_id} found in DLQ index but not in DLQ")
                 else:
-                    logger.warning("DLQ index is empty")
+                    # Only fetch the whole index for diagnostics when the webhook is not in it
+                    dlq_index_data = redis_client.smembers(dlq_index)
+                    if dlq_index_data:
+                        logger.info(f"DLQ index contains: {sorted(dlq_index_data)}")
+                    else:
+                        logger.warning("DLQ index is empty")
                 
                 return False
         else:
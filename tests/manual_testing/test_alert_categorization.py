@@ -9,7 +9,6 @@ Usage:
 """
 
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 
@@ -20,6 +19,7 @@ from services.firm_services import FirmServicesFacade
 from services.firm_business import process_claim
 from evaluation.firm_evaluation_report_builder import FirmEvaluationReportBuilder
 from evaluation.firm_evaluation_report_director import FirmEvaluationReportDirector
+from utils.report_io import dumps_report, write_stdout
 
 def print_report_section(title, section):
     """Print a section of the report in a formatted way."""
@@ -27,7 +27,7 @@ def print_report_section(title, section):
     if section is None:
         print("No data available.")
     else:
-        print(json.dumps(section, indent=2))
+        write_stdout(dumps_report(section))
     print("=" * (len(title) + 8))
 
 def test_inactive_expelled_firm_categorization():
@@ -0,0 +1,39 @@
+"""Unit tests for the CachingFirmServicesFacade class."""
+
+import unittest
+from unittest.mock import patch
+
+from services.caching_facade import CachingFirmServicesFacade
+
+class TestCachingFirmServicesFacade(unittest.TestCase):
+    """Test cases for CachingFirmServicesFacade."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.facade = CachingFirmServicesFacade()
+        self.subject_id = "TEST_SUBJECT_001"
+        self.firm = {"firm_name": "Test Firm", "crd_number": "12345", "source": "SEC"}
+
+    @patch('services.firm_services.FirmServicesFacade.search_firm_by_crd')
+    def test_search_firm_by_crd_reuses_result(self, mock_search):
+        """Test that a found firm is fetched once, whatever entity_name is passed."""
+        mock_search.return_value = self.firm
+
+        first = self.facade.search_firm_by_crd(self.subject_id, "12345")
+        second = self.facade.search_firm_by_crd(self.subject_id, "12345", "Test Firm")
+
+        self.assertEqual(first, self.firm)
+        self.assertIs(second, first)
+        mock_search.assert_called_once_with(self.subject_id, "12345", None)
+
+    @patch('services.firm_services.FirmServicesFacade.search_firm_by_crd')
+    def test_search_firm_by_crd_does_not_cache_misses(self, mock_search):
+        """Test that a miss is searched again on the next call."""
+        mock_search.side_effect = [None, self.firm]
+
+        self.assertIsNone(self.facade.search_firm_by_crd(self.subject_id, "12345"))
+        self.assertEqual(self.facade.search_firm_by_crd(self.subject_id, "12345"), self.firm)
+        self.assertEqual(mock_search.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the CircuitBreaker.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+from unittest.mock import Mock, patch
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
+
+@pytest.fixture
+def clock():
+    """Patch the breaker's monotonic clock with a controllable value."""
+    now = {"t": 1000.0}
+    with patch('utils.circuit_breaker.time.monotonic', side_effect=lambda: now["t"]):
+        yield now
+
+def failing():
+    raise ConnectionError("down")
+
+def test_success_passes_through():
+    """Test that calls pass through and return results while closed."""
+    breaker = CircuitBreaker(fail_max=2)
+    assert breaker.call(lambda x: x * 2, 21) == 42
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_opens_after_consecutive_failures(clock):
+    """Test that the breaker opens after fail_max failures and then fails fast."""
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=10)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    func = Mock()
+    with pytest.raises(CircuitBreakerError):
+        breaker.call(func)
+    func.assert_not_called()
+
+def test_success_resets_failure_count():
+    """Test that a success between failures keeps the breaker closed."""
+    breaker = CircuitBreaker(fail_max=2)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    breaker.call(lambda: None)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_trial_closes_on_success(clock):
+    """Test that a successful trial call after the timeout closes the breaker."""
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=10)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    clock["t"] += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_trial_reopens_on_failure(clock):
+    """Test that a failed trial call re-opens the breaker for another timeout."""
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=10)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    clock["t"] += 10
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitBreakerError):
+        breaker.call(lambda: None)
@@ -119,6 +119,33 @@ class TestFirmEvaluationProcessor(unittest.TestCase):
         self.assertEqual(alerts[0].severity, AlertSeverity.HIGH)
         self.assertEqual(alerts[0].alert_type, "UnresolvedDisclosure")
 
+    def test_disclosures_format_hint(self):
+        """Test that a format hint gives the same result as format detection."""
+        disclosures = [
+            {"disclosureType": "Regulatory Event", "disclosureCount": 2},
+            {"disclosureType": "Arbitration", "disclosureCount": 1}
+        ]
+        business_name = "Test Firm"
+        
+        detected = evaluate_disclosures(disclosures, business_name)
+        hinted = evaluate_disclosures(disclosures, business_name, format_hint="typed_counts")
+        self.assertEqual(detected[:2], hinted[:2])
+        self.assertFalse(hinted[0])
+        self.assertEqual([a.alert_type for a in hinted[2]], ["RegulatoryEventDisclosure", "ArbitrationDisclosure"])
+
+    def test_disclosures_unknown_format_hint(self):
+        """Test that an unknown format hint is rejected instead of silently ignored."""
+        disclosures = [{"disclosureType": "Regulatory Event", "disclosureCount": 2}]
+        with self.assertRaises(ValueError):
+            evaluate_disclosures(disclosures, "Test Firm", format_hint="typed_count")
+
+    def test_disclosures_empty_hint_with_records(self):
+        """Test that the "empty" hint does not hide records that are present."""
+        disclosures = [{"disclosureType": "Regulatory Event", "disclosureCount": 2}]
+        detected = evaluate_disclosures(disclosures, "Test Firm")
+        hinted = evaluate_disclosures(disclosures, "Test Firm", format_hint="empty")
+        self.assertEqual(detected[:2], hinted[:2])
+
     def test_disclosures_recent_resolved(self):
         """Test evaluation with recently resolved disclosures."""
         disclosures = [
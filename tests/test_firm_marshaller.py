@@ -28,6 +28,7 @@ from services.firm_marshaller import (
     fetch_sec_firm_search,
     fetch_sec_firm_by_crd,
     fetch_sec_firm_details,
+    fetch_firm_by_crd_all_sources,
     CACHE_FOLDER,
     DATE_FORMAT,
     MANIFEST_DATE_FORMAT
@@ -261,5 +262,46 @@ class TestFirmMarshaller(unittest.TestCase):
         result = fetch_sec_firm_details(subject_id, "FIRM123", {"crd_number": "123456"})
         self.assertEqual(result, [self.sample_firm_data])
 
+    @patch('services.firm_marshaller.check_cache_or_fetch')
+    def test_fetch_firm_by_crd_all_sources(self, mock_check_cache):
+        """Test the combined SEC + FINRA search by CRD."""
+        mock_check_cache.side_effect = lambda subject_id, agent_name, service, firm_id, params: agent_name
+        
+        result = fetch_firm_by_crd_all_sources("SUBJECT123", " 123456 ")
+        
+        self.assertEqual(result, {
+            "sec": "SEC_FirmIAPD_Agent",
+            "finra": "FINRA_FirmBrokerCheck_Agent"
+        })
+        self.assertEqual(mock_check_cache.call_count, 2)
+        for call in mock_check_cache.call_args_list:
+            subject_id, _, service, firm_id, params = call.args
+            self.assertEqual(subject_id, "SUBJECT123")
+            self.assertEqual(service, "search_firm_by_crd")
+            self.assertEqual(firm_id, "search_crd_123456")
+            self.assertEqual(params, {"crd_number": "123456"})
+        
+        # A single source is fetched on its own
+        mock_check_cache.reset_mock()
+        result = fetch_firm_by_crd_all_sources("SUBJECT123", "123456", sources=("sec",))
+        self.assertEqual(result, {"sec": "SEC_FirmIAPD_Agent"})
+        self.assertEqual(mock_check_cache.call_count, 1)
+
+    @patch('services.firm_marshaller.check_cache_or_fetch')
+    def test_fetch_firm_by_crd_all_sources_call_wrapper(self, mock_check_cache):
+        """Test that each source's fetch runs through the per-source wrapper."""
+        mock_check_cache.side_effect = lambda subject_id, agent_name, service, firm_id, params: agent_name
+        wrapped = []
+        
+        def call(source, fetch):
+            wrapped.append(source)
+            return None if source == "finra" else fetch()
+        
+        result = fetch_firm_by_crd_all_sources("SUBJECT123", "123456", call=call)
+        
+        self.assertEqual(result, {"sec": "SEC_FirmIAPD_Agent", "finra": None})
+        self.assertEqual(sorted(wrapped), ["finra", "sec"])
+        self.assertEqual(mock_check_cache.call_count, 1)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
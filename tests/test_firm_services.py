@@ -194,6 +194,22 @@ class TestFirmServicesFacade(unittest.TestCase):
                 results = self.facade.search_firm(self.subject_id, "Test Firm")
                 self.assertEqual(len(results), 0)
 
+    def test_service_delay_is_shared_across_threads(self):
+        """Test that threads sharing a facade are still spaced by the service delay."""
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+        self.facade.service_delay = 0.1
+        self.facade.last_api_call_time = 0
+
+        def call(_):
+            self.facade._apply_service_delay()
+            return time.time()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            finished = sorted(executor.map(call, range(3)))
+        for earlier, later in zip(finished, finished[1:]):
+            self.assertGreaterEqual(later - earlier, 0.09)
+
 class TestFirmServicesCLI(unittest.TestCase):
     """Test cases for the FirmServices CLI."""
 
@@ -0,0 +1,115 @@
+"""
+Unit tests for the Redis keyspace wait helpers.
+"""
+
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.keyspace_wait import subscribe_keyspace, wait_for_change, wait_for_dead_letter
+
+class FakePubSub:
+    def __init__(self, messages=()):
+        self.messages = list(messages)
+        self.channels = []
+
+    def subscribe(self, *channels):
+        self.channels.extend(channels)
+
+    def get_message(self, timeout=0.0):
+        return self.messages.pop(0) if self.messages else None
+
+class FakeRedis:
+    def __init__(self, flags="", config_error=None):
+        self.flags = flags
+        self.config_error = config_error
+        self.connection_pool = type("Pool", (), {"connection_kwargs": {"db": 1}})()
+        self.pubsub_obj = FakePubSub()
+
+    def config_get(self, name):
+        if self.config_error:
+            raise self.config_error
+        return {name: self.flags}
+
+    def config_set(self, name, value):
+        self.flags = value
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self.pubsub_obj
+
+def test_subscribe_keyspace_enables_events_and_uses_db():
+    """Test that keyspace events are enabled and channels name the client's database."""
+    client = FakeRedis()
+    pubsub = subscribe_keyspace(client, ["webhook_status:abc"])
+    assert client.flags == "KEA"
+    assert pubsub.channels == ["__keyspace@1__:webhook_status:abc"]
+
+def test_subscribe_keyspace_unavailable_returns_none():
+    """Test that a server refusing CONFIG falls back to polling."""
+    assert subscribe_keyspace(FakeRedis(config_error=RuntimeError("CONFIG disabled")), ["k"]) is None
+
+def test_wait_for_change_skips_subscribe_confirmations():
+    """Test that a None message is ignored and the next event wakes the waiter."""
+    pubsub = FakePubSub([None, {"type": "message", "data": "set"}])
+    assert wait_for_change(pubsub, 1.0) is True
+
+def test_wait_for_change_polls_without_pubsub():
+    """Test that the fallback sleeps no longer than the timeout."""
+    assert wait_for_change(None, 0.01) is False
+
+class FakeStatusRedis(FakeRedis):
+    """In-memory stand-in for the webhook status database; CONFIG is refused, so waits poll."""
+
+    def __init__(self):
+        super().__init__(config_error=RuntimeError("CONFIG disabled"))
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            def get(self, key):
+                self.ops.append(lambda: client.values.get(key))
+
+            def sismember(self, key, member):
+                self.ops.append(lambda: member in client.sets.get(key, set()))
+
+            def execute(self):
+                return [op() for op in self.ops]
+
+        return Pipeline()
+
+def test_wait_for_dead_letter_waits_past_failed_status():
+    """Test that a failed status written before the DLQ entry does not end the wait."""
+    client = FakeStatusRedis()
+    client.values["webhook_status:ref_task"] = json.dumps({"status": "failed", "attempts": 3})
+
+    def write_dlq():
+        client.values["dead_letter:webhook:ref_task"] = json.dumps({"webhook_id": "ref_task"})
+        client.sets.setdefault("dead_letter:webhook:index", set()).add("ref_task")
+
+    timer = threading.Timer(0.4, write_dlq)
+    timer.start()
+    try:
+        dlq_raw, in_index = wait_for_dead_letter(client, "ref_task", timeout=5, grace_period=3)
+    finally:
+        timer.cancel()
+    assert json.loads(dlq_raw) == {"webhook_id": "ref_task"}
+    assert in_index
+
+def test_wait_for_dead_letter_gives_up_after_grace_period():
+    """Test that a terminal status without a DLQ entry only waits out the grace period."""
+    client = FakeStatusRedis()
+    client.values["webhook_status:ref_task"] = json.dumps({"status": "failed", "attempts": 3})
+    started = time.monotonic()
+    assert wait_for_dead_letter(client, "ref_task", timeout=30, grace_period=0.3) == (None, False)
+    assert time.monotonic() - started < 2
@@ -0,0 +1,64 @@
+"""
+Unit tests for the TokenBucket rate limiter.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.rate_limiter import TokenBucket
+
+class FakeClock:
+    """Monotonic clock that only advances when sleep() is called."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    """Patch the rate limiter's time source with a fake clock."""
+    fake = FakeClock()
+    with patch('utils.rate_limiter.time', fake):
+        yield fake
+
+def test_burst_up_to_capacity_does_not_sleep(clock):
+    """Test that calls within the bucket capacity return immediately."""
+    bucket = TokenBucket(rate=0.5, capacity=2)
+    assert bucket.take() == 0.0
+    assert bucket.take() == 0.0
+    assert clock.sleeps == []
+
+def test_empty_bucket_waits_for_next_token(clock):
+    """Test that an empty bucket sleeps exactly until a token refills."""
+    bucket = TokenBucket(rate=0.5, capacity=1)
+    bucket.take()
+    assert bucket.take() == pytest.approx(2.0)
+    assert clock.sleeps == [pytest.approx(2.0)]
+
+def test_idle_time_refills_bucket(clock):
+    """Test that tokens accumulate while idle, capped at capacity."""
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.take()
+    bucket.take()
+    clock.now += 60
+    assert bucket.take() == 0.0
+    assert bucket.take() == 0.0
+    assert bucket.take() == pytest.approx(1.0)
+
+@pytest.mark.parametrize("rate,capacity", [(0, 1), (-1, 1), (1, 0)])
+def test_invalid_parameters(rate, capacity):
+    """Test that non-positive rate or capacity is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=rate, capacity=capacity)
@@ -0,0 +1,61 @@
+"""
+Unit tests for the report output helpers.
+"""
+
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+import pytest
+
+# Add project root to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import report_io
+from utils.report_io import build_claim, dumps_report, save_report, stream_report
+
+@pytest.fixture
+def report():
+    return {
+        "claim": build_claim("12345", "TEST FIRM"),
+        "entity": {"firm_name": "TEST FIRM", "crd_number": "12345", "tags": []},
+        "status_evaluation": {
+            "compliance": False,
+            "alerts": [{"alert_type": "Test", "description": "line\nbreak"} for _ in range(3)]
+        },
+        "empty": {},
+        "count": 3
+    }
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_stream_report_matches_dumps_report(tmp_path, report, monkeypatch, use_orjson):
+    """Test that streaming a report writes the same bytes as encoding it whole."""
+    if not use_orjson:
+        monkeypatch.setattr(report_io, "orjson", None)
+    elif report_io.orjson is None:
+        pytest.skip("orjson not installed")
+    path = stream_report(report, tmp_path / "report.json")
+    assert path.read_bytes() == dumps_report(report)
+    assert json.loads(path.read_bytes()) == report
+
+def test_dumps_report_datetimes_match_orjson(monkeypatch):
+    """Test that the json fallback encodes datetimes the way orjson does."""
+    if report_io.orjson is None:
+        pytest.skip("orjson not installed")
+    report = {"generated_at": datetime(2025, 7, 6, 12, 30, 5, 250)}
+    native = dumps_report(report)
+    monkeypatch.setattr(report_io, "orjson", None)
+    assert dumps_report(report) == native
+
+def test_stream_report_empty(tmp_path):
+    """Test that an empty report is written as an empty object."""
+    path = stream_report({}, tmp_path / "report.json")
+    assert path.read_bytes() == b"{}"
+
+def test_save_report_compressed(tmp_path, report):
+    """Test that compressed reports are written next to the requested path."""
+    import gzip
+    data = dumps_report(report)
+    path = save_report(data, tmp_path / "report.json", compress=True)
+    assert path.name == "report.json.gz"
+    assert gzip.decompress(path.read_bytes()) == data
@@ -1,5 +1,8 @@
 """Utility modules for the project."""
 
-from .logging_config import setup_logging, reconfigure_logging, flush_logs, LOGGER_GROUPS
+from .logging_config import setup_logging, reconfigure_logging, flush_logs, LazyJson, LOGGER_GROUPS
+from .rate_limiter import TokenBucket
+from .circuit_breaker import CircuitBreaker, CircuitBreakerError
 
-__all__ = ['setup_logging', 'reconfigure_logging', 'flush_logs', 'LOGGER_GROUPS']
\ No newline at end of file
+__all__ = ['setup_logging', 'reconfigure_logging', 'flush_logs', 'LazyJson', 'LOGGER_GROUPS', 'TokenBucket',
+           'CircuitBreaker', 'CircuitBreakerError']
@@ -0,0 +1,89 @@
+"""
+Circuit breaker for calls to external services.
+
+After a number of consecutive failures the breaker opens and further calls
+fail fast with CircuitBreakerError instead of waiting on a service that is
+down. Once the reset timeout has elapsed a single trial call is let through
+(half-open); success closes the breaker again, failure re-opens it.
+"""
+
+import threading
+import time
+from typing import Any, Callable
+
+
+class CircuitBreakerError(Exception):
+    """Exception raised when a call is rejected because the circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker.
+
+    Args:
+        fail_max: Number of consecutive failures that opens the circuit
+        reset_timeout: Seconds to wait before letting a trial call through
+        name: Optional name used in error messages
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 10.0, name: str = "circuit"):
+        if fail_max < 1:
+            raise ValueError(f"fail_max must be at least 1, got {fail_max}")
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, accounting for an elapsed reset timeout."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitBreakerError(f"{self.name} is open, failing fast")
+                self._state = self.HALF_OPEN
+            elif self._state == self.HALF_OPEN:
+                # Only one trial call at a time while half-open
+                raise CircuitBreakerError(f"{self.name} is half-open, trial call in progress")
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.fail_max:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call func through the breaker.
+
+        Raises:
+            CircuitBreakerError: If the circuit is open
+            Exception: Any exception raised by func, which counts as a failure
+        """
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
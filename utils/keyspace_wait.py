@@ -0,0 +1,144 @@
+"""
+Blocking waits on Redis keys for the webhook test scripts.
+
+The webhook scripts wait for status and dead-letter keys to change. Instead of
+sleeping a fixed interval between reads, they subscribe to Redis keyspace
+notifications for those keys and wake as soon as one is written. When
+notifications cannot be enabled (CONFIG disabled, server unreachable), callers
+fall back to polling.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keyspace events (K) for every command class (A); enabled only when missing
+KEYSPACE_EVENTS = "KEA"
+
+# Status re-reads start this far apart and double up to MAX_POLL_INTERVAL
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 8.0
+
+# Seconds to keep waiting for the DLQ entry once the webhook status is terminal;
+# the API records the failed status before it writes the DLQ entry
+DLQ_GRACE_PERIOD = 10.0
+
+
+def subscribe_keyspace(redis_client: Any, keys: Iterable[str]) -> Optional[Any]:
+    """
+    Subscribe to keyspace notifications for the given keys.
+
+    Enables ``notify-keyspace-events`` on the server if keyspace events are
+    not already turned on.
+
+    Args:
+        redis_client: A redis.Redis client; the channel uses its database number
+        keys: The keys to watch
+
+    Returns:
+        A PubSub object to pass to wait_for_change, or None if keyspace
+        notifications are unavailable
+    """
+    try:
+        flags = redis_client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        if "K" not in flags or "A" not in flags:
+            redis_client.config_set("notify-keyspace-events", KEYSPACE_EVENTS)
+        db = redis_client.connection_pool.connection_kwargs.get("db", 0)
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(*(f"__keyspace@{db}__:{key}" for key in keys))
+        return pubsub
+    except Exception as e:
+        logger.info("Keyspace notifications unavailable, falling back to polling: %s", e)
+        return None
+
+
+def wait_for_change(pubsub: Optional[Any], timeout: float, poll_interval: float = 5.0) -> bool:
+    """
+    Block until a subscribed key changes or the timeout elapses.
+
+    Args:
+        pubsub: The PubSub returned by subscribe_keyspace, or None to poll
+        timeout: Maximum number of seconds to wait
+        poll_interval: Seconds to sleep when pubsub is None
+
+    Returns:
+        True if a change notification arrived, False otherwise
+    """
+    if pubsub is None:
+        time.sleep(max(0.0, min(poll_interval, timeout)))
+        return False
+    deadline = time.monotonic() + timeout
+    remaining = timeout
+    while remaining > 0:
+        # Subscribe confirmations come back as None; keep waiting for a real event
+        if pubsub.get_message(timeout=remaining) is not None:
+            return True
+        remaining = deadline - time.monotonic()
+    return False
+
+
+def wait_for_dead_letter(
+    redis_client: Any,
+    webhook_id: str,
+    timeout: float = 60.0,
+    grace_period: float = DLQ_GRACE_PERIOD
+) -> Tuple[Optional[str], bool]:
+    """
+    Wait for a webhook's dead-letter (DLQ) entry to appear.
+
+    Wakes as soon as the DLQ key is written. The status, DLQ entry and DLQ index
+    membership are read in one pipelined round trip, and the status is
+    re-read with exponential backoff in between. A terminal status ("failed" or
+    3+ attempts) does not end the wait: the DLQ entry is written after it, so
+    the wait is only shortened to grace_period from that point.
+
+    Args:
+        redis_client: A redis.Redis client for the webhook status database
+        webhook_id: The webhook ID ("<reference_id>_<task_id>")
+        timeout: Maximum number of seconds to wait overall
+        grace_period: Seconds to keep waiting once the status is terminal
+
+    Returns:
+        Tuple of (raw DLQ entry or None, whether webhook_id is in the DLQ index)
+    """
+    status_key = f"webhook_status:{webhook_id}"
+    dlq_key = f"dead_letter:webhook:{webhook_id}"
+    dlq_index = "dead_letter:webhook:index"
+
+    pubsub = subscribe_keyspace(redis_client, [dlq_key])
+    deadline = time.monotonic() + timeout
+    delay = MIN_POLL_INTERVAL
+    terminal = False
+    try:
+        while True:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(status_key)
+            pipe.get(dlq_key)
+            pipe.sismember(dlq_index, webhook_id)
+            status_data_raw, dlq_data_raw, in_dlq_index = pipe.execute()
+
+            if dlq_data_raw:
+                return dlq_data_raw, bool(in_dlq_index)
+            if status_data_raw:
+                status_data = json.loads(status_data_raw)
+                status = status_data.get("status")
+                attempts = status_data.get("attempts", 0)
+                logger.info("Webhook status: %s, Attempts: %s", status, attempts)
+                if not terminal and (status == "failed" or attempts >= 3):
+                    terminal = True
+                    logger.info("Webhook status is terminal, waiting up to %ss for the DLQ entry", grace_period)
+                    deadline = min(deadline, time.monotonic() + grace_period)
+            else:
+                logger.info("No webhook status found for %s", webhook_id)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, bool(in_dlq_index)
+            wait_for_change(pubsub, min(delay, remaining), poll_interval=delay)
+            delay = min(delay * 2, MAX_POLL_INTERVAL)
+    finally:
+        if pubsub is not None:
+            pubsub.close()
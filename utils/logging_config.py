@@ -1,3 +1,4 @@
+import json
 import logging
 import logging.handlers
 import os
@@ -137,6 +138,22 @@ def reconfigure_logging(loggers: Dict[str, Any], enabled_groups: Set[str], group
                     logger = logging.getLogger(logger_name)
                     logger.disabled = True
 
+class LazyJson:
+    """Defer JSON serialization of a log argument until a handler formats it.
+
+    Usage: logger.info("Raw data: %s", LazyJson(data)) only pays for
+    json.dumps when the record is actually emitted.
+    """
+
+    __slots__ = ('obj', 'indent')
+
+    def __init__(self, obj: Any, indent: int = 2):
+        self.obj = obj
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=self.indent, default=str)
+
 def flush_logs():
     """Flush all log handlers to ensure logs are written to disk."""
     root_logger = logging.getLogger()
@@ -0,0 +1,59 @@
+"""
+Rate limiting helpers for outbound API calls.
+
+This module provides a token bucket that paces calls to an external service
+only when its request budget is exhausted, instead of sleeping a fixed delay
+before every call.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` tokens per second up to ``capacity``.
+    While tokens remain, take() returns immediately; once the bucket is empty it
+    sleeps just long enough for the requested tokens to become available.
+
+    Args:
+        rate: Number of tokens added per second
+        capacity: Maximum number of tokens the bucket can hold (burst size)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def take(self, tokens: float = 1.0) -> float:
+        """
+        Consume tokens, sleeping only if the bucket does not hold enough.
+
+        Tokens are reserved under the lock before sleeping, so concurrent
+        callers queue up behind each other instead of all waking at once.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            The number of seconds spent waiting
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,161 @@
+"""
+Shared output helpers for the compliance report scripts.
+
+The standalone report scripts all finish the same way: attach the claim and a
+timestamp to the report, save it as JSON and echo it to stdout. Keeping that
+here means serialization changes only need to be made once.
+"""
+
+import gzip
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Computed once per process so a batch run stamps every report consistently
+RUN_STARTED_AT = datetime.now().isoformat()
+
+def build_claim(crd_number: str, firm_name: str) -> Dict[str, Any]:
+    """
+    Build the test claim the report scripts submit for a firm.
+
+    Args:
+        crd_number: The firm's CRD number
+        firm_name: The firm name to claim
+
+    Returns:
+        Claim dictionary suitable for process_claim
+    """
+    return {
+        "reference_id": f"test-ref-{crd_number}",
+        "business_ref": f"BIZ_{crd_number}",
+        "business_name": firm_name,
+        "organization_crd": crd_number
+    }
+
+def _json_default(obj: Any) -> str:
+    """
+    Fallback encoder for values JSON has no type for.
+
+    Datetimes use ISO 8601, matching orjson's native encoding, so a report
+    reads the same whichever encoder wrote it. Anything else becomes str(obj).
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def dumps_report(report: Dict[str, Any]) -> bytes:
+    """
+    Serialize a report to indented UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        report: The report to serialize
+
+    Returns:
+        The encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=_json_default
+        )
+    return json.dumps(report, indent=2, default=_json_default).encode("utf-8")
+
+def stream_report(report: Dict[str, Any], output_file: Union[str, Path]) -> Path:
+    """
+    Write a report to disk one top-level section at a time.
+
+    Each section is encoded and written separately, so peak memory is bounded by
+    the largest section (e.g. a long alert list) rather than the whole report.
+    The file content is identical to dumps_report(report).
+
+    Args:
+        report: The report to write
+        output_file: Path of the JSON file to write
+
+    Returns:
+        The path that was written
+    """
+    path = Path(output_file)
+    with open(path, "wb", buffering=1 << 20) as f:
+        if not report:
+            f.write(b"{}")
+            return path
+        f.write(b"{")
+        for index, (key, value) in enumerate(report.items()):
+            f.write(b",\n  " if index else b"\n  ")
+            f.write(dumps_report(str(key)))
+            f.write(b": ")
+            # Encoded JSON never contains raw newlines inside strings, so
+            # indenting every line nests the section one level deeper
+            f.write(dumps_report(value).replace(b"\n", b"\n  "))
+        f.write(b"\n}")
+    return path
+
+def save_report(data: bytes, output_file: Union[str, Path], compress: bool = False) -> Path:
+    """
+    Write an encoded report to disk, optionally gzip-compressed.
+
+    Args:
+        data: The encoded report, as returned by dumps_report
+        output_file: Path of the JSON file to write
+        compress: Write a gzip file at output_file + ".gz" instead
+
+    Returns:
+        The path that was written
+    """
+    path = Path(output_file)
+    if compress:
+        path = path.with_name(path.name + ".gz")
+        with gzip.open(path, "wb") as f:
+            f.write(data)
+    else:
+        path.write_bytes(data)
+    return path
+
+def write_stdout(data: bytes) -> None:
+    """Write encoded output straight to stdout, bypassing the text layer when possible."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(data.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.write(b"\n")
+    buffer.flush()
+
+def finalize_report(report: Dict[str, Any], claim: Dict[str, Any], output_file: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Attach the claim and generation timestamp to a report, save it and print it.
+
+    The timestamp is the process start time (RUN_STARTED_AT). The report is
+    serialized once and the same bytes are written to the output file and to
+    stdout.
+
+    Args:
+        report: The compliance report returned by process_claim
+        claim: The claim the report was generated for
+        output_file: Path of the JSON file to write
+
+    Returns:
+        The finalized report
+    """
+    report["claim"] = claim
+    report["generated_at"] = RUN_STARTED_AT
+
+    data = dumps_report(report)
+    Path(output_file).write_bytes(data)
+    logger.info("Compliance report saved to %s", output_file)
+
+    write_stdout(data)
+    return report